@@ -0,0 +1,305 @@
+import os
+import json
+import time
+import numpy as np
+import pandas as pd
+
+# Folder holding one columnar cache directory per treebank
+cache_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+
+# Integer columns stored as one .npy file each (token-level unless noted)
+ARRAY_COLUMNS = {
+    "form": np.int32,
+    "lemma": np.int32,
+    "upos": np.int16,
+    "xpos": np.int16,
+    "head": np.int16,
+    "deprel": np.int16,
+    "sent_offsets": np.int64,  # sentence-level, n_sentences + 1 entries
+    "sent_genre": np.int16,    # sentence-level
+    "sent_doc": np.int32,      # sentence-level
+}
+
+# String columns interned into a vocabulary (one entry per line, id = line number)
+VOCAB_COLUMNS = ["form", "lemma", "upos", "xpos", "deprel"]
+
+
+def intern(vocab, value):
+    """
+    Return the integer id of a string, adding it to the vocabulary if it is new.
+    """
+    index = vocab.get(value)
+    if index is None:
+        index = len(vocab)
+        vocab[value] = index
+    return index
+
+
+def parse_conllu(conllu_path):
+    """
+    Parse a CoNLL-U file into interned columns.
+    Multi-word token ranges (e.g. "9-10") and empty nodes (e.g. "9.1") are skipped,
+    so the stored tokens are exactly the syntactic words of the basic tree.
+    """
+    vocabs = {name: {} for name in VOCAB_COLUMNS}
+    genres = {}
+    columns = {name: [] for name in ARRAY_COLUMNS}
+    doc_ids, sent_ids, texts = [], [], []
+
+    genre = "unknown"
+    sent_id = ""
+    text = ""
+    in_sentence = False
+    columns["sent_offsets"].append(0)
+
+    def close_sentence():
+        columns["sent_offsets"].append(len(columns["form"]))
+        columns["sent_genre"].append(intern(genres, genre))
+        columns["sent_doc"].append(len(doc_ids) - 1)
+        sent_ids.append(sent_id)
+        texts.append(text)
+
+    with open(conllu_path, "r", encoding="utf-8") as infile:
+        for line in infile:
+            line = line.rstrip("\n")
+            if not line:
+                if in_sentence:
+                    close_sentence()
+                    in_sentence = False
+                    sent_id, text = "", ""
+                continue
+            if line.startswith("#"):
+                key, _, value = line[1:].partition("=")
+                key, value = key.strip(), value.strip()
+                if key == "newdoc id":
+                    doc_ids.append(value)
+                    genre = "unknown"
+                elif key == "meta::genre":
+                    genre = value
+                elif key == "sent_id":
+                    sent_id = value
+                elif key == "text":
+                    text = value
+                continue
+
+            fields = line.split("\t")
+            if "-" in fields[0] or "." in fields[0]:
+                continue
+            if not doc_ids:
+                doc_ids.append("")
+            in_sentence = True
+            columns["form"].append(intern(vocabs["form"], fields[1]))
+            columns["lemma"].append(intern(vocabs["lemma"], fields[2]))
+            columns["upos"].append(intern(vocabs["upos"], fields[3]))
+            columns["xpos"].append(intern(vocabs["xpos"], fields[4]))
+            columns["head"].append(int(fields[6]) if fields[6].isdigit() else -1)
+            columns["deprel"].append(intern(vocabs["deprel"], fields[7]))
+
+    if in_sentence:
+        close_sentence()
+
+    arrays = {name: np.asarray(values, dtype=ARRAY_COLUMNS[name]) for name, values in columns.items()}
+    vocab_lists = {name: list(vocab) for name, vocab in vocabs.items()}
+    metadata = {
+        "genres": list(genres),
+        "doc_ids": doc_ids,
+        "sent_ids": sent_ids,
+    }
+    return arrays, vocab_lists, metadata, texts
+
+
+def source_signature(conllu_path):
+    """
+    Return the size and modification time used to detect a changed source file.
+    """
+    stat = os.stat(conllu_path)
+    return {"source": os.path.abspath(conllu_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def convert_treebank(conllu_path, cache_dir):
+    """
+    Convert a CoNLL-U treebank into the columnar cache format:
+    one .npy file per integer column, one vocabulary file per interned column,
+    the raw sentence texts, and a metadata.json file (genres, document and sentence ids).
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    arrays, vocab_lists, metadata, texts = parse_conllu(conllu_path)
+
+    for name, array in arrays.items():
+        np.save(os.path.join(cache_dir, f"{name}.npy"), array)
+    for name, vocab in vocab_lists.items():
+        with open(os.path.join(cache_dir, f"{name}.vocab"), "w", encoding="utf-8") as vocab_file:
+            vocab_file.write("\n".join(vocab))
+    with open(os.path.join(cache_dir, "texts.txt"), "w", encoding="utf-8") as text_file:
+        text_file.write("\n".join(texts))
+
+    # The metadata file is written last: its presence marks a complete cache.
+    metadata.update(source_signature(conllu_path))
+    with open(os.path.join(cache_dir, "metadata.json"), "w", encoding="utf-8") as json_file:
+        json.dump(metadata, json_file, indent=4)
+    return cache_dir
+
+
+def load_treebank(cache_dir):
+    """
+    Load a converted treebank. Integer columns are memory-mapped, so loading is
+    independent of the treebank size; vocabularies are read into lists.
+    """
+    treebank = {}
+    for name in ARRAY_COLUMNS:
+        treebank[name] = np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode="r")
+    for name in VOCAB_COLUMNS:
+        with open(os.path.join(cache_dir, f"{name}.vocab"), "r", encoding="utf-8") as vocab_file:
+            treebank[f"{name}_vocab"] = vocab_file.read().split("\n")
+    with open(os.path.join(cache_dir, "metadata.json"), "r", encoding="utf-8") as json_file:
+        treebank["metadata"] = json.load(json_file)
+    treebank["cache_dir"] = cache_dir
+    return treebank
+
+
+def load_sentence_texts(treebank):
+    """
+    Return the "# text =" line of every sentence, in sentence order.
+    """
+    with open(os.path.join(treebank["cache_dir"], "texts.txt"), "r", encoding="utf-8") as text_file:
+        return text_file.read().split("\n")
+
+
+def is_cache_fresh(conllu_path, cache_dir):
+    """
+    Check whether the cache exists and was built from the current version of the source file.
+    """
+    metadata_path = os.path.join(cache_dir, "metadata.json")
+    if not os.path.exists(metadata_path):
+        return False
+    with open(metadata_path, "r", encoding="utf-8") as json_file:
+        metadata = json.load(json_file)
+    signature = source_signature(conllu_path)
+    return all(metadata.get(key) == value for key, value in signature.items() if key != "source")
+
+
+def load_or_convert(conllu_path, cache_dir=None):
+    """
+    Load the columnar cache of a treebank, (re)building it first if it is missing or stale.
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(cache_root, os.path.basename(conllu_path).replace(".conllu", ""))
+    if not is_cache_fresh(conllu_path, cache_dir):
+        convert_treebank(conllu_path, cache_dir)
+    return load_treebank(cache_dir)
+
+
+def token_sentence_ids(treebank):
+    """
+    Return, for every token, the index of the sentence it belongs to.
+    """
+    offsets = np.asarray(treebank["sent_offsets"])
+    return np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+
+def token_positions(treebank):
+    """
+    Return the 1-based CoNLL-U id of every token within its sentence.
+    """
+    offsets = np.asarray(treebank["sent_offsets"])
+    sentence_ids = token_sentence_ids(treebank)
+    return np.arange(offsets[-1]) - offsets[sentence_ids] + 1
+
+
+def basic_stats(treebank):
+    """
+    Vectorized version of the notebook's basic_stats.
+    """
+    n_sentences = len(treebank["sent_offsets"]) - 1
+    n_tokens = int(treebank["sent_offsets"][-1])
+    lemma_vocab = np.array([lemma.lower() for lemma in treebank["lemma_vocab"]])
+    used_lemmas = np.unique(lemma_vocab[np.unique(treebank["lemma"])])
+    return {
+        "n_sentences": n_sentences,
+        "n_tokens": n_tokens,
+        "avg_tokens_per_sent": round(n_tokens / n_sentences, 2),
+        "unique_lemmas": int(np.count_nonzero(used_lemmas != "_")),
+    }
+
+
+def pos_ngrams(treebank, n=3, top=10):
+    """
+    Count UPOS n-grams that do not cross a sentence boundary and return the most frequent ones.
+    Each n-gram is packed into a single integer so the counting is one np.unique call.
+    """
+    upos = np.asarray(treebank["upos"], dtype=np.int64)
+    n_tokens = len(upos)
+    if n_tokens < n:
+        return []
+    base = len(treebank["upos_vocab"])
+    sentence_ids = token_sentence_ids(treebank)
+
+    starts = np.arange(n_tokens - n + 1)
+    valid = sentence_ids[starts] == sentence_ids[starts + n - 1]
+    starts = starts[valid]
+
+    codes = np.zeros(len(starts), dtype=np.int64)
+    for k in range(n):
+        codes = codes * base + upos[starts + k]
+    unique_codes, counts = np.unique(codes, return_counts=True)
+    order = np.argsort(-counts, kind="stable")[:top]
+
+    results = []
+    for code, count in zip(unique_codes[order], counts[order]):
+        labels = []
+        for _ in range(n):
+            code, label_id = divmod(int(code), base)
+            labels.append(treebank["upos_vocab"][label_id])
+        results.append((tuple(reversed(labels)), int(count)))
+    return results
+
+
+def mean_dependency_length(treebank):
+    """
+    Average absolute distance between a token and its head, ignoring roots.
+    """
+    heads = np.asarray(treebank["head"], dtype=np.int64)
+    mask = heads > 0
+    return float(np.abs(heads[mask] - token_positions(treebank)[mask]).mean())
+
+
+def genre_pos_table(treebank):
+    """
+    Build the genre x UPOS count table with a single bincount.
+    """
+    n_genres = len(treebank["metadata"]["genres"])
+    n_upos = len(treebank["upos_vocab"])
+    token_genres = np.asarray(treebank["sent_genre"], dtype=np.int64)[token_sentence_ids(treebank)]
+    counts = np.bincount(token_genres * n_upos + treebank["upos"], minlength=n_genres * n_upos)
+    return pd.DataFrame(
+        counts.reshape(n_genres, n_upos),
+        index=treebank["metadata"]["genres"],
+        columns=treebank["upos_vocab"],
+    )
+
+
+if __name__ == "__main__":
+    gum_folder = os.path.dirname(os.path.abspath(__file__))
+    for conllu_name in ["en_gum-ud-dev.conllu", "en_gum-ud-test.conllu"]:
+        conllu_path = os.path.join(gum_folder, conllu_name)
+        if not os.path.exists(conllu_path):
+            print(f"File {conllu_path} not found.")
+            continue
+
+        start = time.perf_counter()
+        treebank = load_or_convert(conllu_path)
+        load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        stats = basic_stats(treebank)
+        trigrams = pos_ngrams(treebank, n=3)
+        dep_length = mean_dependency_length(treebank)
+        genre_table = genre_pos_table(treebank)
+        compute_time = time.perf_counter() - start
+
+        print(f"{conllu_name} (loaded in {load_time * 1000:.1f} ms, statistics in {compute_time * 1000:.1f} ms)")
+        for key, value in stats.items():
+            print(f"- {key}: {value}")
+        print(f"- POS trigrams: {trigrams}")
+        print(f"- Average dependency length: {dep_length:.2f}")
+        print(genre_table)
@@ -0,0 +1,208 @@
+import os
+import sys
+import json
+import numpy as np
+
+from gum_columnar import load_or_convert, load_sentence_texts
+
+# The shared tagset tables live at the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from tagsets import CATEGORIES, EXPECTED_LABELS
+
+# Folder where the GUM gold "that" test set is exported (same one-sentence-per-line format as Data/Test)
+gum_folder = os.path.dirname(os.path.abspath(__file__))
+export_folder = os.path.join(gum_folder, "..", "Data", "Test", "GUM")
+
+# Columns of the columnar cache that get an inverted index
+INDEXED_COLUMNS = ["form", "lemma"]
+
+# Expected label of each "that" category in the custom, BNC (C5) and Penn tagsets
+CATEGORY_LABELS = {
+    category: {tagset: labels[category] for tagset, labels in EXPECTED_LABELS.items()}
+    for category in CATEGORIES
+}
+
+
+def build_index(treebank, column):
+    """
+    Build a CSR-style inverted index from the lowercased values of a column to token positions.
+    Returns the key vocabulary, the indptr array and the positions array:
+    the tokens of key k are positions[indptr[k]:indptr[k + 1]].
+    """
+    keys = {}
+    value_to_key = np.array(
+        [keys.setdefault(value.lower(), len(keys)) for value in treebank[f"{column}_vocab"]],
+        dtype=np.int32,
+    )
+    token_keys = value_to_key[treebank[column]]
+    positions = np.argsort(token_keys, kind="stable").astype(np.int64)
+    counts = np.bincount(token_keys, minlength=len(keys))
+    indptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+    return list(keys), indptr, positions
+
+
+def save_index(treebank):
+    """
+    Build and persist the form and lemma indexes next to the columnar cache.
+    The cache signature is recorded so the index is rebuilt whenever the cache is.
+    """
+    cache_dir = treebank["cache_dir"]
+    for column in INDEXED_COLUMNS:
+        keys, indptr, positions = build_index(treebank, column)
+        with open(os.path.join(cache_dir, f"index_{column}.vocab"), "w", encoding="utf-8") as vocab_file:
+            vocab_file.write("\n".join(keys))
+        np.save(os.path.join(cache_dir, f"index_{column}_indptr.npy"), indptr)
+        np.save(os.path.join(cache_dir, f"index_{column}_positions.npy"), positions)
+    with open(os.path.join(cache_dir, "index.json"), "w", encoding="utf-8") as json_file:
+        json.dump({"mtime_ns": treebank["metadata"]["mtime_ns"], "size": treebank["metadata"]["size"]}, json_file)
+
+
+def load_index(treebank):
+    """
+    Load the persisted indexes (building them first if missing or stale) into the treebank dict.
+    """
+    cache_dir = treebank["cache_dir"]
+    index_meta_path = os.path.join(cache_dir, "index.json")
+    fresh = False
+    if os.path.exists(index_meta_path):
+        with open(index_meta_path, "r", encoding="utf-8") as json_file:
+            index_meta = json.load(json_file)
+        fresh = all(index_meta.get(key) == treebank["metadata"][key] for key in ["mtime_ns", "size"])
+    if not fresh:
+        save_index(treebank)
+
+    for column in INDEXED_COLUMNS:
+        with open(os.path.join(cache_dir, f"index_{column}.vocab"), "r", encoding="utf-8") as vocab_file:
+            keys = vocab_file.read().split("\n")
+        treebank[f"index_{column}"] = {
+            "keys": {key: i for i, key in enumerate(keys)},
+            "indptr": np.load(os.path.join(cache_dir, f"index_{column}_indptr.npy"), mmap_mode="r"),
+            "positions": np.load(os.path.join(cache_dir, f"index_{column}_positions.npy"), mmap_mode="r"),
+        }
+    return treebank
+
+
+def lookup(treebank, word, column="form"):
+    """
+    Return the global token positions whose lowercased form (or lemma) equals word.
+    """
+    index = treebank[f"index_{column}"]
+    key = index["keys"].get(word.lower())
+    if key is None:
+        return np.zeros(0, dtype=np.int64)
+    return np.asarray(index["positions"][index["indptr"][key]:index["indptr"][key + 1]])
+
+
+def to_sentence_token(treebank, positions):
+    """
+    Convert global token positions into (sentence index, 1-based token id) arrays.
+    """
+    offsets = np.asarray(treebank["sent_offsets"])
+    sentences = np.searchsorted(offsets, positions, side="right") - 1
+    return sentences, positions - offsets[sentences] + 1
+
+
+def classify_that(xpos, deprel, head_deprel):
+    """
+    Map the analysis of a "that" token to one of our five categories (None if it fits none).
+    The category follows GUM's PTB tag, which marks relative "that" as WDT wherever the clause attaches
+    (clefts, nested or orphaned relatives), while the UD head relation only separates complementizers.
+    Demonstrative pronouns are grouped with determiners, as CLAWS tags both DD1.
+    Disfluencies and multi-word subordinators ("so that") are left out.
+    """
+    if deprel in ("reparandum", "fixed"):
+        return None
+    if xpos == "IN" and deprel == "mark":
+        # A complementizer whose clause modifies a noun ("the fact that ...") vs. a verb ("said that ...")
+        if head_deprel.startswith("acl") and head_deprel != "acl:relcl":
+            return "noun_conjunction"
+        return "verb_conjunction"
+    if xpos == "WDT":
+        return "pronoun"
+    if xpos == "DT":
+        return "determiner"
+    if xpos == "RB":
+        return "adverb"
+    return None
+
+
+def that_gold_rows(treebank, word="that"):
+    """
+    Yield one gold row per sentence for the first occurrence of word, using the inverted index
+    instead of scanning the treebank (get_that_tag also only looks at the first occurrence).
+    """
+    positions = lookup(treebank, word)
+    sentences, token_ids = to_sentence_token(treebank, positions)
+    offsets = np.asarray(treebank["sent_offsets"])
+    texts = load_sentence_texts(treebank)
+    sent_ids = treebank["metadata"]["sent_ids"]
+    genres = treebank["metadata"]["genres"]
+
+    seen = set()
+    for position, sentence, token_id in zip(positions, sentences, token_ids):
+        if sentence in seen:
+            continue
+        seen.add(sentence)
+
+        upos = treebank["upos_vocab"][treebank["upos"][position]]
+        xpos = treebank["xpos_vocab"][treebank["xpos"][position]]
+        deprel = treebank["deprel_vocab"][treebank["deprel"][position]]
+        head = int(treebank["head"][position])
+        head_deprel = "root"
+        if head > 0:
+            head_deprel = treebank["deprel_vocab"][treebank["deprel"][offsets[sentence] + head - 1]]
+
+        category = classify_that(xpos, deprel, head_deprel)
+        if category is None:
+            continue
+        yield {
+            "sent_id": sent_ids[sentence],
+            "genre": genres[treebank["sent_genre"][sentence]],
+            "token_id": int(token_id),
+            "upos": upos,
+            "xpos": xpos,
+            "deprel": deprel,
+            "head_deprel": head_deprel,
+            "category": category,
+            **CATEGORY_LABELS[category],
+            "text": texts[sentence],
+        }
+
+
+def export_that_test_set(treebanks, output_dir=export_folder):
+    """
+    Write the gold "that" sentences of the given treebanks as one Data/Test-style file per category,
+    plus a TSV file holding the token position and the custom/BNC/Penn labels of every sentence.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rows = [row for treebank in treebanks for row in that_gold_rows(treebank)]
+
+    for category in CATEGORY_LABELS:
+        output_file_path = os.path.join(output_dir, f"gum_that_{category}.txt")
+        with open(output_file_path, "w", encoding="utf-8") as output_file:
+            for row in rows:
+                if row["category"] == category:
+                    output_file.write(row["text"] + "\n")
+
+    columns = ["sent_id", "genre", "token_id", "upos", "xpos", "deprel", "head_deprel", "category", "custom", "bnc", "penn", "text"]
+    gold_path = os.path.join(output_dir, "gum_that_gold.tsv")
+    with open(gold_path, "w", encoding="utf-8") as gold_file:
+        gold_file.write("\t".join(columns) + "\n")
+        for row in rows:
+            gold_file.write("\t".join(str(row[column]) for column in columns) + "\n")
+    return rows
+
+
+if __name__ == "__main__":
+    conllu_names = sys.argv[1:] or ["en_gum-ud-dev.conllu", "en_gum-ud-test.conllu"]
+    treebanks = []
+    for conllu_name in conllu_names:
+        conllu_path = os.path.join(gum_folder, conllu_name)
+        if not os.path.exists(conllu_path):
+            print(f"File {conllu_path} not found.")
+            continue
+        treebanks.append(load_index(load_or_convert(conllu_path)))
+
+    rows = export_that_test_set(treebanks)
+    counts = {category: sum(row["category"] == category for row in rows) for category in CATEGORY_LABELS}
+    print(f"Exported {len(rows)} gold 'that' sentences to {export_folder}: {counts}")
@@ -1,13 +1,17 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
 import nltk
 from nltk.tokenize import word_tokenize
 from nltk.corpus import wordnet
 from nltk.stem import WordNetLemmatizer
 
-# Download required NLTK data packages
-nltk.download("punkt")
-nltk.download("averaged_perceptron_tagger_eng") 
-nltk.download("wordnet")
+from tagsets import PENN_TO_CLAWS8
+import corpus_io
+from corpus_reader import CorpusReader
+from nltk_resources import ensure_nltk_resources
+
+# NLTK data packages needed to tag (checked offline against the local cache by main and tag_shard)
+NLTK_RESOURCES = ("punkt", "averaged_perceptron_tagger_eng", "wordnet")
 
 lemmatizer = WordNetLemmatizer()
 
@@ -36,72 +40,38 @@ def get_lemma(token, tag):
 
 def map_tag(nltk_tag):
     """
-    Map NLTK (Penn Treebank) tags to custom CLAWS8-like tags.
-    """
-    mapping = {
-        "CC": "CC",        # Coordinating conjunction
-        "CD": "CD",        # Cardinal number
-        "DT": "AT0",       # Determiner/article (CLAWS8 uses AT0 for articles)
-        "EX": "EX",        # Existential there
-        "FW": "FW",        # Foreign word
-        "IN": "II",        # Preposition or subordinating conjunction 
-        "JJ": "AJ0",       # Adjective, positive degree
-        "JJR": "AJC",      # Adjective, comparative
-        "JJS": "AJS",      # Adjective, superlative
-        "LS": "LS",        # List marker
-        "MD": "MD",        # Modal
-        "NN": "NN1",       # Singular common noun
-        "NNS": "NN2",      # Plural common noun
-        "NNP": "NP",       # Singular proper noun
-        "NNPS": "NPS",     # Plural proper noun
-        "PDT": "DD0",      # Pre-determiner
-        "POS": "POS",      # Possessive ending
-        "PRP": "PP",       # Personal pronoun
-        "PRP$": "PP$",     # Possessive pronoun
-        "RB": "RG0",       # Adverb, base form
-        "RBR": "RGC",      # Adverb, comparative
-        "RBS": "RGS",      # Adverb, superlative
-        "RP": "RP",        # Particle
-        "SYM": "SYM",      # Symbol
-        "TO": "TO",        # To
-        "UH": "UH",        # Interjection
-        "VB": "VVB",       # Verb, base form
-        "VBD": "VVD",      # Verb, past tense
-        "VBG": "VVG",      # Verb, present participle/gerund
-        "VBN": "VVN",      # Verb, past participle
-        "VBP": "VVP",      # Verb, non-3rd person singular present
-        "VBZ": "VVZ",      # Verb, 3rd person singular present
-        "WDT": "WDT",      # Wh-determiner
-        "WP": "WP",        # Wh-pronoun
-        "WP$": "WPS",      # Possessive wh-pronoun
-        "WRB": "WRB"       # Wh-adverb
-    }
-    return mapping.get(nltk_tag, nltk_tag)
-
-def process_file(input_filename, output_filename, that_override_tag, lexicon):
+    Map NLTK (Penn Treebank) tags to custom CLAWS8-like tags (see tagsets.PENN_TO_CLAWS8).
     """
-    Process a file: for each line (sentence), tokenize and POS-tag the text,
-    override "that" tags as needed, compute the lemma using get_lemma, and update the lexicon.
-    Returns the set of custom tags used in the file.
+    return PENN_TO_CLAWS8.get(nltk_tag, nltk_tag)
+
+def tag_sentence(sentence, that_override_tag):
     """
-    with open(input_filename, "r", encoding="utf-8") as infile:
-        lines = infile.readlines()
+    Tokenize and POS-tag a sentence, override the tag of "that" and compute lemmas.
+    Returns a list of (word, custom_tag, lemma) triples.
+    """
+    words = word_tokenize(sentence)
+    tagged = nltk.pos_tag(words)
+    triples = []
+    for word, tag in tagged:
+        # Override the tag for "that" (case insensitive)
+        if word.lower() == "that":
+            custom_tag = that_override_tag
+        else:
+            custom_tag = map_tag(tag)
+        # Compute lemma using the custom get_lemma function
+        triples.append((word, custom_tag, get_lemma(word, custom_tag)))
+    return triples
 
-    sentences = [line.strip() for line in lines if line.strip()]
+def write_tagged_sentences(tagged_sentences, output_filename, lexicon):
+    """
+    Write tagged sentences in TreeTagger training format (word<TAB>tag, blank line between sentences)
+    and update the lexicon. Returns the set of custom tags used.
+    """
     processed_lines = []
     file_tags = set()
-    
-    for sentence in sentences:
-        words = word_tokenize(sentence)
-        tagged = nltk.pos_tag(words)
-        for word, tag in tagged:
-            # Override the tag for "that" (case insensitive)
-            if word.lower() == "that":
-                custom_tag = that_override_tag
-            else:
-                custom_tag = map_tag(tag)
-            # Compute lemma using the custom get_lemma function
-            lemma = get_lemma(word, custom_tag)
+
+    for triples in tagged_sentences:
+        for word, custom_tag, lemma in triples:
             processed_lines.append(f"{word}\t{custom_tag}")
             file_tags.add(custom_tag)
             # Update the lexicon: add a (custom_tag, lemma) pair for the word.
@@ -109,20 +79,81 @@ def process_file(input_filename, output_filename, that_override_tag, lexicon):
                 lexicon[word].add((custom_tag, lemma))
             else:
                 lexicon[word] = {(custom_tag, lemma)}
-        
+
         processed_lines.append("")
 
-    with open(output_filename, "w", encoding="utf-8") as outfile:
+    with corpus_io.open_text(output_filename, "w") as outfile:
         outfile.write("\n".join(processed_lines))
     return file_tags
 
+def read_sentences(input_filename):
+    """
+    Read the non-blank lines (one sentence per line) of a corpus file.
+    """
+    with corpus_io.open_text(input_filename) as infile:
+        lines = infile.readlines()
+    return [line.strip() for line in lines if line.strip()]
+
+def tag_shard(args):
+    """
+    Worker-process entry point: tag sentences start..stop-1 of a file.
+    The file should be plain: a compressed file would be decompressed in full by every worker.
+    """
+    input_filename, start, stop, that_override_tag = args
+    ensure_nltk_resources(*NLTK_RESOURCES)
+    with CorpusReader(input_filename) as reader:
+        return [tag_sentence(sentence, that_override_tag) for sentence in reader.iter_sentences(start, stop)]
+
+def process_file(input_filename, output_filename, that_override_tag, lexicon, n_workers=1):
+    """
+    Process a file: for each line (sentence), tokenize and POS-tag the text,
+    override "that" tags as needed, compute the lemma using get_lemma, and update the lexicon.
+    With n_workers > 1, the file is split into contiguous sentence shards tagged in parallel.
+    Returns the set of custom tags used in the file.
+    """
+    if n_workers > 1:
+        # A compressed input is expanded once into a plain temporary file, so every worker
+        # maps it instead of decompressing the whole file into its own memory
+        with corpus_io.plain_copy(input_filename) as plain_input:
+            with CorpusReader(plain_input) as reader:
+                shards = reader.shard_ranges(n_workers)
+                index_path = reader.index_path
+            try:
+                with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                    shard_results = executor.map(
+                        tag_shard, [(plain_input, start, stop, that_override_tag) for start, stop in shards]
+                    )
+                    tagged_sentences = [triples for shard in shard_results for triples in shard]
+            finally:
+                if plain_input != input_filename and os.path.exists(index_path):
+                    os.remove(index_path)
+    else:
+        sentences = read_sentences(input_filename)
+        tagged_sentences = [tag_sentence(sentence, that_override_tag) for sentence in sentences]
+    return write_tagged_sentences(tagged_sentences, output_filename, lexicon)
+
+def write_opencls(tags, opencls_path):
+    """
+    Write openCLs.txt containing all unique tags.
+    """
+    with open(opencls_path, "w", encoding="utf-8") as tag_file:
+        tag_file.write(" ".join(sorted(tags)))
+
+def write_lexicon(lexicon, lexicon_path):
+    """
+    Write lexicon.txt: each line contains a word followed by its tag–lemma pairs (tab separated).
+    Finally, append a punctuation line.
+    """
+    with corpus_io.open_text(lexicon_path, "w") as lex_file:
+        for word in sorted(lexicon.keys(), key=lambda x: x.lower()):
+            pairs = sorted(lexicon[word])
+            pair_strs = [f"{tag}\t{lemma}" for tag, lemma in pairs]
+            lex_file.write(f"{word}\t" + "\t".join(pair_strs) + "\n")
+        lex_file.write(".\tSENT\t.\n")
+
 # Define input and output directories.
 input_dir = "Data/Train/"
 output_dir = "Training/"
-os.makedirs(output_dir, exist_ok=True)
-
-all_tags = set()
-global_lexicon = {}
 
 # List of files to process
 files_to_process = [
@@ -133,37 +164,38 @@ files_to_process = [
     ("that_singular_determiner.txt", "determiner_formatted.txt", "DD1")
 ]
 
-# Process each file, updating the set of all custom tags and the global lexicon.
-for infile_name, outfile_name, override in files_to_process:
-    input_path = os.path.join(input_dir, infile_name)
-    output_path = os.path.join(output_dir, outfile_name)
-    tags = process_file(input_path, output_path, override, global_lexicon)
-    all_tags.update(tags)
-
-# Write openCLs.txt containing all unique tags 
-opencls_path = os.path.join(output_dir, "openCLs.txt")
-with open(opencls_path, "w", encoding="utf-8") as tag_file:
-    tag_file.write(" ".join(sorted(all_tags)))
-
-# Write lexicon.txt:
-# Each line contains a word followed by its tag–lemma pairs (tab separated).
-# Finally, append a punctuation line.
-lexicon_path = os.path.join(output_dir, "lexicon.txt")
-with open(lexicon_path, "w", encoding="utf-8") as lex_file:
-    for word in sorted(global_lexicon.keys(), key=lambda x: x.lower()):
-        pairs = sorted(global_lexicon[word])
-        pair_strs = [f"{tag}\t{lemma}" for tag, lemma in pairs]
-        lex_file.write(f"{word}\t" + "\t".join(pair_strs) + "\n")
-    lex_file.write(".\tSENT\t.\n")
-
-# Concatenate the contents of all processed files into train.txt
-train_file_path = os.path.join(output_dir, "train.txt")
-with open(train_file_path, "w", encoding="utf-8") as train_file:
-    for _, outfile_name, _ in files_to_process:
-        file_path = os.path.join(output_dir, outfile_name)
-        with open(file_path, "r", encoding="utf-8") as infile:
-            content = infile.read()
-            train_file.write(content)
-            train_file.write("\n") 
-
-print("Processing complete. Files have been saved in the 'Training/' directory.")
+def main(n_workers=1, input_directory=input_dir, compression=corpus_io.default_compression):
+    """
+    Inputs may be compressed (e.g. Data/Train/that_pronoun.txt.gz); with a compression,
+    the formatted files, lexicon.txt and train.txt are written compressed as well.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    ensure_nltk_resources(*NLTK_RESOURCES)
+
+    all_tags = set()
+    global_lexicon = {}
+
+    # Process each file, updating the set of all custom tags and the global lexicon.
+    for infile_name, outfile_name, override in files_to_process:
+        input_path = corpus_io.resolve_path(os.path.join(input_directory, infile_name))
+        output_path = corpus_io.output_path(os.path.join(output_dir, outfile_name), compression)
+        tags = process_file(input_path, output_path, override, global_lexicon, n_workers)
+        all_tags.update(tags)
+
+    write_opencls(all_tags, os.path.join(output_dir, "openCLs.txt"))
+    write_lexicon(global_lexicon, corpus_io.output_path(os.path.join(output_dir, "lexicon.txt"), compression))
+
+    # Concatenate the contents of all processed files into train.txt
+    train_file_path = corpus_io.output_path(os.path.join(output_dir, "train.txt"), compression)
+    with corpus_io.open_text(train_file_path, "w") as train_file:
+        for _, outfile_name, _ in files_to_process:
+            file_path = corpus_io.output_path(os.path.join(output_dir, outfile_name), compression)
+            with corpus_io.open_text(file_path) as infile:
+                content = infile.read()
+                train_file.write(content)
+                train_file.write("\n") 
+
+    print("Processing complete. Files have been saved in the 'Training/' directory.")
+
+if __name__ == "__main__":
+    main()
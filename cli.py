@@ -0,0 +1,118 @@
+import os
+import sys
+import time
+import argparse
+
+# Every subcommand imports its module lazily, inside its handler, so that `--help` and small jobs
+# do not pay for nltk, pandas, sklearn, matplotlib or treetaggerwrapper.
+
+
+def run_prepare(args):
+    import Tagging
+    input_directory = Tagging.input_dir
+    if args.dedup:
+        import dedup
+        dedup.save_report(dedup.deduplicate(threshold=args.dedup_threshold))
+        input_directory = dedup.dedup_folder
+    Tagging.main(n_workers=args.workers, input_directory=input_directory)
+
+
+def run_lexicon(args):
+    import lexicon
+    lexicon.main()
+
+
+def run_opencls(args):
+    import openCls
+    openCls.main()
+
+
+def run_format(args):
+    import format_file
+    format_file.main()
+
+
+def run_evaluate(args):
+    if args.tagset == "custom":
+        import our_model_evaluation
+        our_model_evaluation.main(n_workers=args.workers)
+    elif args.tagset == "bnc":
+        import evaluation_bnc
+        evaluation_bnc.main()
+    elif args.tagset == "penn":
+        import evaluation_penn
+        evaluation_penn.main()
+    else:
+        import json
+        import evaluation_multi_tagset
+        report = evaluation_multi_tagset.evaluate_all_tagsets()
+        print(json.dumps(report, indent=4))
+
+
+def run_analyze(args):
+    import statical_analysis
+    statical_analysis.main()
+
+
+def run_errors(args):
+    import error_analysis
+    report = error_analysis.analyze_errors(args.results, threshold=args.threshold)
+    error_analysis.save_report(report, os.path.join(args.results, "error_analysis.json"))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description='TreeTagger "that" disambiguation: data preparation, evaluation and analysis.',
+    )
+    parser.add_argument("--time", action="store_true", help="print the wall-clock time of the command")
+    parser.add_argument("--compress", choices=["gzip", "xz", "zstd"],
+                        help="compress the written artifacts (train.txt, lexicon.txt, results dumps, ...)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    prepare = subparsers.add_parser("prepare", help="tag Data/Train and write the Training/ files (Tagging.py)")
+    prepare.add_argument("--workers", type=int, default=1, help="worker processes per input file")
+    prepare.add_argument("--dedup", action="store_true",
+                         help="drop near-duplicate and test-leaking sentences first (dedup.py)")
+    prepare.add_argument("--dedup-threshold", type=float, default=0.8, help="MinHash Jaccard threshold")
+    prepare.set_defaults(handler=run_prepare)
+
+    simple_commands = [
+        ("lexicon", "build a lexicon from formatted training files (lexicon.py)", run_lexicon),
+        ("opencls", "extract the open class tags from a lexicon (openCls.py)", run_opencls),
+        ("format", "convert word/tag files to TreeTagger format (format_file.py)", run_format),
+    ]
+    for name, help_text, handler in simple_commands:
+        subparsers.add_parser(name, help=help_text).set_defaults(handler=handler)
+
+    evaluate = subparsers.add_parser("evaluate", help="evaluate taggers on Data/Test")
+    evaluate.add_argument("--tagset", choices=["custom", "bnc", "penn", "all"], default="custom",
+                          help="custom: Training/*.par models, bnc/penn: reference models, all: one-pass comparison")
+    evaluate.add_argument("--workers", type=int, default=1,
+                          help="worker processes per test file (custom tagset: shards each file across processes)")
+    evaluate.set_defaults(handler=run_evaluate)
+
+    analyze = subparsers.add_parser("analyze", help="statistical analysis of Data/Test (statical_analysis.py)")
+    analyze.set_defaults(handler=run_analyze)
+
+    errors = subparsers.add_parser("errors", help="context features and clusters of the misclassified sentences "
+                                                  "in the Results/ dumps (error_analysis.py)")
+    errors.add_argument("--results", default="Results", help="folder holding the *_results_*.txt dumps")
+    errors.add_argument("--threshold", type=float, default=0.6, help="cosine similarity for clustering errors")
+    errors.set_defaults(handler=run_errors)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.compress:
+        # Read by corpus_io when the subcommand's modules are (lazily) imported
+        os.environ["CORPUS_COMPRESSION"] = args.compress
+    start = time.perf_counter()
+    args.handler(args)
+    if args.time:
+        print(f"{args.command} finished in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
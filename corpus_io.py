@@ -0,0 +1,196 @@
+import io
+import os
+import gzip
+import lzma
+import shutil
+import signal
+import tempfile
+import subprocess
+from contextlib import contextmanager
+
+# Compressed corpus files are recognised by their suffix (or, without one, by their magic bytes)
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".xz": "xz", ".zst": "zstd"}
+SUFFIXES = {compression: suffix for suffix, compression in COMPRESSION_SUFFIXES.items()}
+MAGIC_BYTES = {"gzip": b"\x1f\x8b", "xz": b"\xfd7zXZ\x00", "zstd": b"\x28\xb5\x2f\xfd"}
+
+BUFFER_SIZE = 1 << 20  # 1 MiB read/write buffers
+THREADS = os.cpu_count() or 1
+
+# Compression of the written artifacts (train.txt, lexicon.txt, formatted files, results dumps);
+# set CORPUS_COMPRESSION to gzip, xz or zstd (default: plain text).
+default_compression = os.environ.get("CORPUS_COMPRESSION") or None
+
+try:
+    import zstandard
+except ImportError:  # the zstd command line tool is used instead when available
+    zstandard = None
+
+
+def detect_compression(path):
+    """
+    Compression of a file from its suffix, or from its first bytes if the suffix says nothing.
+    Returns None for plain files.
+    """
+    suffix = os.path.splitext(path)[1]
+    if suffix in COMPRESSION_SUFFIXES:
+        return COMPRESSION_SUFFIXES[suffix]
+    if os.path.isfile(path):
+        with open(path, "rb") as infile:
+            head = infile.read(6)
+        for compression, magic in MAGIC_BYTES.items():
+            if head.startswith(magic):
+                return compression
+    return None
+
+
+def variants(path):
+    """
+    The plain and compressed names of a file (path, path.gz, path.xz, path.zst), whatever suffix path has.
+    """
+    plain = output_path(path, None)
+    return [plain] + [plain + suffix for suffix in COMPRESSION_SUFFIXES]
+
+
+def resolve_path(path):
+    """
+    Return the most recently modified existing variant of path (plain, .gz, .xz or .zst), so a copy left
+    behind by a run with another compression is never preferred over the current one.
+    The path is returned unchanged when no variant exists, so callers still report the expected name.
+    """
+    existing = [variant for variant in variants(path) if os.path.exists(variant)]
+    if not existing:
+        return path
+    return max(existing, key=lambda variant: os.stat(variant).st_mtime_ns)
+
+
+def output_path(path, compression=default_compression):
+    """
+    Name of an output file written with the given compression (any compression suffix is replaced).
+    """
+    root, suffix = os.path.splitext(path)
+    if suffix in COMPRESSION_SUFFIXES:
+        path = root
+    return path + SUFFIXES[compression] if compression else path
+
+
+def external_command(compression, reading, threads=THREADS):
+    """
+    Multithreaded command line (de)compressor for a compression, or None if it is not installed.
+    """
+    if compression == "gzip" and shutil.which("pigz"):
+        return ["pigz", "-dc" if reading else "-c", "-p", str(threads)]
+    if compression == "xz" and shutil.which("xz"):
+        return ["xz", "-dc" if reading else "-c", f"-T{threads}"]
+    if compression == "zstd" and shutil.which("zstd"):
+        return ["zstd", "-dcq" if reading else "-cq", f"-T{threads}"]
+    return None
+
+
+class ProcessStream(io.RawIOBase):
+    """
+    Raw stream reading the output of (or writing the input of) a compressor process bound to a file.
+    Closing the stream waits for the process and raises OSError if it failed.
+    """
+
+    def __init__(self, command, path, reading):
+        self.reading = reading
+        self.path = path
+        self.command = command
+        self.file = open(path, "rb" if reading else "wb")
+        self.process = subprocess.Popen(
+            command,
+            stdin=self.file if reading else subprocess.PIPE,
+            stdout=subprocess.PIPE if reading else self.file,
+            bufsize=0,
+        )
+        self.pipe = self.process.stdout if reading else self.process.stdin
+
+    def readable(self):
+        return self.reading
+
+    def writable(self):
+        return not self.reading
+
+    def readinto(self, buffer):
+        return self.pipe.readinto(buffer)
+
+    def write(self, data):
+        return self.pipe.write(data)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self.pipe.close()
+            returncode = self.process.wait()
+            self.file.close()
+        finally:
+            super().close()
+        # A reader closed before the end of the stream stops the decompressor with SIGPIPE
+        if returncode != 0 and not (self.reading and returncode == -signal.SIGPIPE):
+            raise OSError(f"{' '.join(self.command)} failed on {self.path} (exit status {returncode})")
+
+
+def open_binary(path, mode="rb", compression=None, threads=THREADS):
+    """
+    Open a possibly compressed file as a buffered binary stream ("rb" or "wb").
+    Compression defaults to detect_compression(path) when reading and to the path suffix when writing.
+    A multithreaded command line tool (pigz, xz -T, zstd -T) is used when installed,
+    otherwise the gzip / lzma / zstandard modules.
+    """
+    reading = mode == "rb"
+    if compression is None:
+        compression = detect_compression(path) if reading else COMPRESSION_SUFFIXES.get(os.path.splitext(path)[1])
+    if compression is None:
+        return open(path, mode, buffering=BUFFER_SIZE)
+
+    command = external_command(compression, reading, threads)
+    if command is not None:
+        raw = ProcessStream(command, path, reading)
+    elif compression == "gzip":
+        raw = gzip.open(path, mode)
+    elif compression == "xz":
+        raw = lzma.open(path, mode)
+    elif compression == "zstd" and zstandard is not None:
+        raw = zstandard.open(path, mode)
+    else:
+        raise RuntimeError(f"Reading or writing {path} needs the zstd command or the zstandard package.")
+    return io.BufferedReader(raw, BUFFER_SIZE) if reading else io.BufferedWriter(raw, BUFFER_SIZE)
+
+
+def open_text(path, mode="r", encoding="utf-8", compression=None, threads=THREADS):
+    """
+    Text-mode counterpart of open_binary, usable wherever the pipeline used open(path, mode, encoding=...).
+    Mode "a" is only supported for plain files.
+    """
+    if mode == "a":
+        return open(path, mode, encoding=encoding, buffering=BUFFER_SIZE)
+    stream = open_binary(path, "rb" if mode == "r" else "wb", compression, threads)
+    return io.TextIOWrapper(stream, encoding=encoding)
+
+
+def read_bytes(path):
+    """
+    Whole (decompressed) content of a file.
+    """
+    with open_binary(path) as infile:
+        return infile.read()
+
+
+@contextmanager
+def plain_copy(path):
+    """
+    Yield a path to the uncompressed content of path, for external tools that need plain files
+    (e.g. train-tree-tagger). Compressed files are expanded into a temporary file removed afterwards.
+    """
+    if detect_compression(path) is None:
+        yield path
+        return
+    handle, tmp_path = tempfile.mkstemp(prefix=os.path.basename(output_path(path, None)) + ".",
+                                        dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(handle, "wb") as outfile, open_binary(path) as infile:
+            shutil.copyfileobj(infile, outfile, BUFFER_SIZE)
+        yield tmp_path
+    finally:
+        os.remove(tmp_path)
@@ -0,0 +1,118 @@
+import os
+import json
+import mmap
+from array import array
+
+from corpus_io import detect_compression, read_bytes
+
+# Suffix of the persisted sentence-offset index written next to each corpus file
+INDEX_SUFFIX = ".idx"
+
+
+class CorpusReader:
+    """
+    Memory-mapped reader for one-sentence-per-line corpus files (Data/Test, Data/Train).
+    A sentence-offset index (start/end byte of every non-blank line, surrounding whitespace trimmed)
+    is persisted next to the file and only rebuilt when the file's size or modification time changes.
+    Compressed files (.gz, .xz, .zst) cannot be mapped and are decompressed into memory once instead.
+    """
+
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_path = index_path or path + INDEX_SUFFIX
+        if detect_compression(path):
+            self.file = None
+            self.data = read_bytes(path)
+        else:
+            self.file = open(path, "rb")
+            size = os.fstat(self.file.fileno()).st_size
+            # mmap cannot map an empty file
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.starts, self.ends = self.load_or_build_index()
+
+    def signature(self):
+        stat = os.stat(self.path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def build_index(self):
+        """
+        Scan the mapped bytes line by line. Blank lines are recognised on the raw bytes
+        and never decoded.
+        """
+        starts, ends = array("q"), array("q")
+        data = self.data
+        size = len(data)
+        position = 0
+        while position < size:
+            newline = data.find(b"\n", position)
+            end = size if newline == -1 else newline
+            line = data[position:end]
+            stripped = line.strip()
+            if stripped:
+                starts.append(position + len(line) - len(line.lstrip()))
+                ends.append(position + len(line.rstrip()))
+            position = end + 1
+        return starts, ends
+
+    def load_or_build_index(self):
+        signature = self.signature()
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb") as index_file:
+                header = json.loads(index_file.readline())
+                if header.get("size") == signature["size"] and header.get("mtime_ns") == signature["mtime_ns"]:
+                    starts, ends = array("q"), array("q")
+                    starts.frombytes(index_file.read(header["count"] * starts.itemsize))
+                    ends.frombytes(index_file.read(header["count"] * ends.itemsize))
+                    return starts, ends
+
+        starts, ends = self.build_index()
+        # A process-unique temporary name, so concurrent rebuilds of a stale index never share one
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as index_file:
+            index_file.write((json.dumps({**signature, "count": len(starts)}) + "\n").encode("utf-8"))
+            index_file.write(starts.tobytes())
+            index_file.write(ends.tobytes())
+        os.replace(tmp_path, self.index_path)
+        return starts, ends
+
+    def __len__(self):
+        return len(self.starts)
+
+    def raw(self, i):
+        """
+        Zero-copy view of the bytes of sentence i.
+        """
+        return memoryview(self.data)[self.starts[i]:self.ends[i]]
+
+    def sentence(self, i):
+        return str(self.raw(i), "utf-8")
+
+    def iter_sentences(self, start=0, stop=None):
+        """
+        Iterate over the decoded sentences start..stop-1.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        for i in range(start, stop):
+            yield self.sentence(i)
+
+    def shard_ranges(self, n_shards):
+        """
+        Split the sentences into n_shards contiguous (start, stop) ranges of near-equal size.
+        """
+        n = len(self)
+        n_shards = max(1, min(n_shards, n)) if n else 1
+        bounds = [n * k // n_shards for k in range(n_shards + 1)]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        if self.file is not None:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
@@ -0,0 +1,115 @@
+import os
+import sys
+import json
+import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import treetaggerwrapper
+
+import Tagging
+import corpus_io
+from train_models import train_model
+from that_tagging import get_that_tag
+
+# Define folder paths
+output_folder = "Results"
+report_path = os.path.join(output_folder, "cross_validation_report.json")
+
+
+def load_categories(input_dir=Tagging.input_dir):
+    """
+    Read the five Data/Train category files.
+    Returns a list of (category id, expected "that" tag, sentences).
+    """
+    categories = []
+    for infile_name, _, override in Tagging.files_to_process:
+        sentences = Tagging.read_sentences(corpus_io.resolve_path(os.path.join(input_dir, infile_name)))
+        categories.append((infile_name.replace(".txt", ""), override, sentences))
+    return categories
+
+
+def tag_category(args):
+    """
+    Tag and lemmatize every sentence of one category (runs in a worker process).
+    """
+    sentences, override = args
+    return [Tagging.tag_sentence(sentence, override) for sentence in sentences]
+
+
+def assign_folds(n_sentences, k, seed):
+    """
+    Shuffle sentence indexes deterministically and deal them into k folds.
+    """
+    indexes = list(range(n_sentences))
+    random.Random(seed).shuffle(indexes)
+    return [indexes[fold::k] for fold in range(k)]
+
+
+def run_fold(fold, categories, tagged, folds, options=None):
+    """
+    Train a model on every fold but one and evaluate get_that_tag on the held-out fold.
+    Returns the accuracy (in %) per category.
+    """
+    with tempfile.TemporaryDirectory(prefix=f"cv_fold_{fold}_") as work_dir:
+        lexicon = {}
+        train_sentences = []
+        for c in range(len(categories)):
+            held_out = set(folds[c][fold])
+            train_sentences.extend(triples for i, triples in enumerate(tagged[c]) if i not in held_out)
+
+        tags = Tagging.write_tagged_sentences(train_sentences, os.path.join(work_dir, "train.txt"), lexicon)
+        Tagging.write_opencls(tags, os.path.join(work_dir, "openCLs.txt"))
+        Tagging.write_lexicon(lexicon, os.path.join(work_dir, "lexicon.txt"))
+        train_model({"name": "fold_model", "train_file": "train.txt"}, options=options, folder=work_dir)
+
+        tagger = treetaggerwrapper.TreeTagger(TAGPARFILE=os.path.join(work_dir, "fold_model.par"))
+        accuracies = {}
+        for c, (category_id, expected_label, sentences) in enumerate(categories):
+            test_indexes = folds[c][fold]
+            correct = sum(get_that_tag(tagger, sentences[i]) == expected_label for i in test_indexes)
+            accuracies[category_id] = (correct / len(test_indexes)) * 100 if test_indexes else 0
+        return accuracies
+
+
+def cross_validate(k=5, seed=0, max_workers=None, options=None):
+    """
+    Run k-fold cross-validation over the Data/Train category files.
+    Sentences are tagged and lemmatized once and shared by all folds; folds run in a process pool.
+    Returns the mean and variance of the per-category accuracies.
+    """
+    categories = load_categories()
+    Tagging.ensure_nltk_resources(*Tagging.NLTK_RESOURCES)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        tagged = list(executor.map(tag_category, [(sentences, override) for _, override, sentences in categories]))
+        folds = [assign_folds(len(sentences), k, seed) for _, _, sentences in categories]
+        fold_results = list(executor.map(
+            run_fold,
+            range(k),
+            [categories] * k,
+            [tagged] * k,
+            [folds] * k,
+            [options] * k,
+        ))
+
+    report = {"k": k, "seed": seed, "folds": fold_results, "categories": {}}
+    for category_id, _, _ in categories:
+        values = np.array([result[category_id] for result in fold_results])
+        report["categories"][category_id] = {"mean": float(values.mean()), "variance": float(values.var())}
+    overall = np.array([np.mean(list(result.values())) for result in fold_results])
+    report["overall"] = {"mean": float(overall.mean()), "variance": float(overall.var())}
+    return report
+
+
+if __name__ == "__main__":
+    k = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    report = cross_validate(k=k)
+
+    for category_id, stats in report["categories"].items():
+        print(f"{category_id}: {stats['mean']:.2f}% (variance {stats['variance']:.2f})")
+    print(f"Overall: {report['overall']['mean']:.2f}% (variance {report['overall']['variance']:.2f})")
+
+    os.makedirs(output_folder, exist_ok=True)
+    with open(report_path, "w", encoding="utf-8") as json_file:
+        json.dump(report, json_file, indent=4)
+    print(f"Cross-validation Report saved in {report_path}")
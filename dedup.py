@@ -0,0 +1,175 @@
+import os
+import re
+import sys
+import json
+import zlib
+import numpy as np
+
+from Tagging import files_to_process
+from that_tagging import file_configs
+import corpus_io
+from corpus_reader import CorpusReader
+
+# Define folder paths
+train_folder = "Data/Train"
+dedup_folder = "Data/Train_dedup"
+output_folder = "Results"
+report_path = os.path.join(output_folder, "dedup_report.json")
+
+# MinHash / LSH settings: 128 permutations split into 16 bands of 8 rows puts the
+# LSH detection threshold at about (1/16) ** (1/8) ~ 0.71 Jaccard similarity.
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+THRESHOLD = 0.8          # estimated Jaccard similarity above which two sentences are near-duplicates
+SHINGLE_SIZE = 3         # word n-gram size
+MERSENNE_PRIME = (1 << 31) - 1
+CHUNK_SHINGLES = 1 << 18  # shingles hashed per batch (bounds memory to CHUNK_SHINGLES x NUM_PERM)
+
+word_pattern = re.compile(r"\w+")
+
+
+def shingles(sentence):
+    """
+    Hash the word n-grams of a normalized sentence into 31-bit integers.
+    """
+    words = word_pattern.findall(sentence.lower())
+    if len(words) < SHINGLE_SIZE:
+        grams = [" ".join(words)]
+    else:
+        grams = [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+    return [zlib.crc32(gram.encode("utf-8")) & MERSENNE_PRIME for gram in grams]
+
+
+def minhash_signatures(sentences, seed=1):
+    """
+    Compute the MinHash signature of every sentence as one (n_sentences, NUM_PERM) array.
+    All shingles are hashed in large batches and reduced per sentence with np.minimum.reduceat,
+    so the cost is linear in the total number of shingles.
+    """
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, MERSENNE_PRIME, size=NUM_PERM).astype(np.uint64)
+    b = rng.randint(0, MERSENNE_PRIME, size=NUM_PERM).astype(np.uint64)
+
+    # Every hash value is below 2^31, so signatures are stored as uint32 (512 bytes per sentence)
+    signatures = np.empty((len(sentences), NUM_PERM), dtype=np.uint32)
+    start = 0
+    while start < len(sentences):
+        # Gather sentences until the batch holds about CHUNK_SHINGLES shingles
+        batch, lengths = [], []
+        stop = start
+        while stop < len(sentences) and (not batch or len(batch) < CHUNK_SHINGLES):
+            sentence_shingles = shingles(sentences[stop])
+            batch.extend(sentence_shingles)
+            lengths.append(len(sentence_shingles))
+            stop += 1
+        values = np.array(batch, dtype=np.uint64)
+        hashed = (values[:, None] * a[None, :] + b[None, :]) % MERSENNE_PRIME
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        signatures[start:stop] = np.minimum.reduceat(hashed, offsets, axis=0).astype(np.uint32)
+        start = stop
+    return signatures
+
+
+def find(parents, i):
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+
+def near_duplicate_clusters(signatures, threshold=THRESHOLD):
+    """
+    LSH banding: sentences sharing any band hash become candidates; each bucket member is checked
+    against the bucket's first member (estimated Jaccard = fraction of equal signature rows)
+    and merged with union-find. Returns the cluster root of every sentence.
+    """
+    n = len(signatures)
+    parents = list(range(n))
+    coefficients = np.array([(1 << (13 * k % 61)) | 1 for k in range(ROWS)], dtype=np.uint64)
+    for band in range(BANDS):
+        band_rows = signatures[:, band * ROWS:(band + 1) * ROWS]
+        band_hashes = (band_rows * coefficients[None, :]).sum(axis=1)
+        order = np.argsort(band_hashes, kind="stable")
+        sorted_hashes = band_hashes[order]
+        bucket_starts = np.flatnonzero(np.concatenate([[True], sorted_hashes[1:] != sorted_hashes[:-1]]))
+        bucket_ends = np.concatenate([bucket_starts[1:], [n]])
+        for bucket_start, bucket_end in zip(bucket_starts, bucket_ends):
+            if bucket_end - bucket_start < 2:
+                continue
+            members = order[bucket_start:bucket_end]
+            first = members[0]
+            similarity = (signatures[members[1:]] == signatures[first]).mean(axis=1)
+            for member, score in zip(members[1:], similarity):
+                if score >= threshold:
+                    root_a, root_b = find(parents, int(first)), find(parents, int(member))
+                    if root_a != root_b:
+                        parents[max(root_a, root_b)] = min(root_a, root_b)
+    return [find(parents, i) for i in range(n)]
+
+
+def deduplicate(input_dir=train_folder, output_dir=dedup_folder, test_configs=file_configs, threshold=THRESHOLD):
+    """
+    Remove near-duplicate sentences within and across the Data/Train category files, and training
+    sentences that leak from Data/Test. The first occurrence of a cluster is kept (test sentences
+    come first, so a leaking training sentence is always dropped).
+    Writes the filtered category files to output_dir and returns the report.
+    """
+    sources = []  # (kind, file name, sentence)
+    for config in test_configs:
+        if os.path.exists(config["filepath"]):
+            with CorpusReader(config["filepath"]) as reader:
+                sources.extend(("test", config["filename"], sentence) for sentence in reader.iter_sentences())
+    for infile_name, _, _ in files_to_process:
+        with CorpusReader(corpus_io.resolve_path(os.path.join(input_dir, infile_name))) as reader:
+            sources.extend(("train", infile_name, sentence) for sentence in reader.iter_sentences())
+
+    roots = near_duplicate_clusters(minhash_signatures([sentence for _, _, sentence in sources]), threshold)
+
+    kept = {infile_name: [] for infile_name, _, _ in files_to_process}
+    report = {"threshold": threshold, "files": {}, "leakage": [], "cross_category": [], "within_category": 0}
+    seen_roots = set()
+    for i, (kind, file_name, sentence) in enumerate(sources):
+        root = roots[i]
+        if kind == "test":
+            seen_roots.add(root)
+            continue
+        stats = report["files"].setdefault(file_name, {"input": 0, "kept": 0})
+        stats["input"] += 1
+        if root not in seen_roots:
+            seen_roots.add(root)
+            kept[file_name].append(sentence)
+            stats["kept"] += 1
+            continue
+        kind_of_root, file_of_root, sentence_of_root = sources[root]
+        if kind_of_root == "test":
+            report["leakage"].append({"train_file": file_name, "sentence": sentence,
+                                      "test_file": file_of_root, "test_sentence": sentence_of_root})
+        elif file_of_root != file_name:
+            report["cross_category"].append({"file": file_name, "sentence": sentence,
+                                             "duplicate_of_file": file_of_root, "duplicate_of": sentence_of_root})
+        else:
+            report["within_category"] += 1
+
+    os.makedirs(output_dir, exist_ok=True)
+    for infile_name, sentences in kept.items():
+        with open(os.path.join(output_dir, infile_name), "w", encoding="utf-8") as outfile:
+            outfile.write("\n".join(sentences) + "\n")
+    return report
+
+
+def save_report(report, path=report_path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as json_file:
+        json.dump(report, json_file, indent=4, ensure_ascii=False)
+    print(f"Deduplication Report saved in {path}")
+
+
+if __name__ == "__main__":
+    threshold = float(sys.argv[1]) if len(sys.argv) > 1 else THRESHOLD
+    report = deduplicate(threshold=threshold)
+    for file_name, stats in report["files"].items():
+        print(f"{file_name}: kept {stats['kept']} of {stats['input']} sentences")
+    print(f"Within-category near-duplicates: {report['within_category']}, "
+          f"cross-category: {len(report['cross_category'])}, train/test leakage: {len(report['leakage'])}")
+    save_report(report)
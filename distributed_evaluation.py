@@ -0,0 +1,312 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import argparse
+import multiprocessing
+
+import tagsets
+from corpus_reader import CorpusReader
+from that_tagging import file_configs, get_that_tag, save_reports
+from evaluation_multi_tagset import tagger_settings, normalize_tag
+
+# Define folder paths
+training_folder = "Training"
+output_folder = "Results"
+default_queue_dir = os.path.join(output_folder, "eval_queue")
+
+# Work queue defaults
+UNIT_SIZE = 50          # sentences per work unit
+LEASE_SECONDS = 300.0   # a claimed unit returns to the queue if its lease is not renewed in time
+MAX_ATTEMPTS = 3        # after this many failed/expired attempts a unit is marked failed
+
+
+def connect(queue_dir):
+    connection = sqlite3.connect(os.path.join(queue_dir, "queue.sqlite"), timeout=60, isolation_level=None)
+    connection.execute("PRAGMA busy_timeout = 60000")
+    return connection
+
+
+def result_path(queue_dir, unit_id):
+    return os.path.join(queue_dir, "results", f"unit_{unit_id}.json")
+
+
+def init_queue(queue_dir, model_name="our_model", tagset="custom", unit_size=UNIT_SIZE, configs=file_configs,
+               reset=False):
+    """
+    Coordinator: split every test file into sentence-range work units and store them in the SQLite queue.
+    Re-running init with the same settings and unchanged test files is idempotent (existing units are kept
+    with their status). A queue created with a different model, tagset or unit size, or over test files whose
+    size or modification time has changed since, is refused (ValueError) unless reset is set,
+    in which case its units and result files are discarded first.
+    The queue uses SQLite's default rollback journal rather than WAL, which needs shared memory
+    and does not work when the queue directory is on a network filesystem.
+    """
+    os.makedirs(os.path.join(queue_dir, "results"), exist_ok=True)
+    connection = connect(queue_dir)
+    connection.execute("PRAGMA journal_mode = DELETE")  # also converts queues created in WAL mode
+    connection.executescript("""
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE IF NOT EXISTS units (
+            id INTEGER PRIMARY KEY,
+            position INTEGER,
+            file_id TEXT,
+            filepath TEXT,
+            expected_label TEXT,
+            start INTEGER,
+            stop INTEGER,
+            status TEXT DEFAULT 'pending',
+            lease_owner TEXT,
+            lease_expires REAL,
+            attempts INTEGER DEFAULT 0,
+            error TEXT,
+            UNIQUE (file_id, start, stop)
+        );
+    """)
+    if tagset == "custom":
+        settings = {"TAGPARFILE": os.path.join(training_folder, f"{model_name}.par")}
+    else:
+        settings = tagger_settings[tagset]
+    corpus = {}
+    for config in configs:
+        if os.path.exists(config["filepath"]):
+            stat = os.stat(config["filepath"])
+            corpus[config["id"]] = {"filepath": config["filepath"], "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    fingerprint = json.dumps({"model_name": model_name, "tagset": tagset, "unit_size": unit_size,
+                              "tagger_settings": settings, "corpus": corpus}, sort_keys=True)
+    existing = read_meta(connection).get("fingerprint")
+    has_units = connection.execute("SELECT COUNT(*) FROM units").fetchone()[0] > 0
+    if existing != fingerprint and (existing is not None or has_units):
+        if not reset:
+            connection.close()
+            raise ValueError(f"Queue {queue_dir} was created with different settings ({existing}); "
+                             "use another --queue-dir or pass --reset")
+        connection.execute("DELETE FROM units")
+        for result_file in os.listdir(os.path.join(queue_dir, "results")):
+            os.remove(os.path.join(queue_dir, "results", result_file))
+    meta = {"model_name": model_name, "tagset": tagset, "tagger_settings": json.dumps(settings),
+            "fingerprint": fingerprint}
+    for key, value in meta.items():
+        connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    position = 0
+    for config in configs:
+        if not os.path.exists(config["filepath"]):
+            print(f"File {config['filepath']} not found.")
+            continue
+        with CorpusReader(config["filepath"]) as reader:
+            n_sentences = len(reader)
+        for start in range(0, n_sentences, unit_size):
+            connection.execute(
+                "INSERT OR IGNORE INTO units (position, file_id, filepath, expected_label, start, stop) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (position, config["id"], config["filepath"], tagsets.expected_label(tagset, config["id"]),
+                 start, min(start + unit_size, n_sentences)),
+            )
+            position += 1
+    connection.close()
+
+
+def read_meta(connection):
+    return dict(connection.execute("SELECT key, value FROM meta").fetchall())
+
+
+def claim_unit(connection, worker_id, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+    """
+    Atomically lease the next pending (or expired) unit. Returns the unit row or None when nothing is left.
+    """
+    now = time.time()
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        connection.execute(
+            "UPDATE units SET status = 'failed' "
+            "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+            (now, max_attempts),
+        )
+        row = connection.execute(
+            "SELECT id, file_id, filepath, expected_label, start, stop FROM units "
+            "WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?) "
+            "ORDER BY id LIMIT 1",
+            (now,),
+        ).fetchone()
+        if row is not None:
+            connection.execute(
+                "UPDATE units SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE id = ?",
+                (worker_id, now + lease_seconds, row[0]),
+            )
+        connection.execute("COMMIT")
+    except sqlite3.Error:
+        connection.execute("ROLLBACK")
+        raise
+    return row
+
+
+def renew_lease(connection, unit_id, worker_id, lease_seconds=LEASE_SECONDS):
+    connection.execute(
+        "UPDATE units SET lease_expires = ? WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+        (time.time() + lease_seconds, unit_id, worker_id),
+    )
+
+
+def finish_unit(connection, unit_id, worker_id, error=None, max_attempts=MAX_ATTEMPTS):
+    """
+    Mark a unit done, or hand it back for a retry (failed once max_attempts is reached).
+    """
+    if error is None:
+        connection.execute("UPDATE units SET status = 'done', error = NULL WHERE id = ?", (unit_id,))
+    else:
+        connection.execute(
+            "UPDATE units SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, error = ? "
+            "WHERE id = ? AND lease_owner = ?",
+            (max_attempts, error, unit_id, worker_id),
+        )
+
+
+def write_json_atomic(path, payload):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as json_file:
+        json.dump(payload, json_file)
+    os.replace(tmp_path, path)
+
+
+def run_worker(queue_dir, worker_id=None, lease_seconds=LEASE_SECONDS, tagger=None):
+    """
+    Worker: claim units until the queue is empty, tag each sentence range get_that_tag-style
+    and write one result file per unit. Result files are idempotent: a unit whose result file
+    already exists (e.g. the worker died before marking it done) is only marked done.
+    tagger optionally replaces the TreeTagger started from the queue settings (e.g. a stub in tests).
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    connection = connect(queue_dir)
+    meta = read_meta(connection)
+    tagset = meta["tagset"]
+    if tagger is None:
+        import treetaggerwrapper
+        tagger = treetaggerwrapper.TreeTagger(**json.loads(meta["tagger_settings"]))
+    processed = 0
+
+    while True:
+        unit = claim_unit(connection, worker_id, lease_seconds)
+        if unit is None:
+            break
+        unit_id, file_id, filepath, expected_label, start, stop = unit
+        output_path = result_path(queue_dir, unit_id)
+        if os.path.exists(output_path):
+            finish_unit(connection, unit_id, worker_id)
+            continue
+        try:
+            results = []
+            with CorpusReader(filepath) as reader:
+                for i, sentence in enumerate(reader.iter_sentences(start, stop)):
+                    results.append([sentence, expected_label, normalize_tag(tagset, get_that_tag(tagger, sentence))])
+                    if i % 10 == 9:
+                        renew_lease(connection, unit_id, worker_id, lease_seconds)
+            write_json_atomic(output_path, {"unit_id": unit_id, "file_id": file_id, "start": start,
+                                            "stop": stop, "worker": worker_id, "results": results})
+            finish_unit(connection, unit_id, worker_id)
+            processed += 1
+        except Exception as error:  # any failure puts the unit back for another attempt
+            finish_unit(connection, unit_id, worker_id, error=repr(error))
+            print(f"Worker {worker_id} failed on unit {unit_id}: {error!r}")
+
+    connection.close()
+    return processed
+
+
+def queue_status(queue_dir):
+    connection = connect(queue_dir)
+    counts = dict(connection.execute("SELECT status, COUNT(*) FROM units GROUP BY status").fetchall())
+    connection.close()
+    return counts
+
+
+def reduce_results(queue_dir, folder=output_folder):
+    """
+    Reducer: merge the per-unit result files into the usual Results/ reports
+    (per-file results, confusion matrices, classification and accuracy reports).
+    """
+    connection = connect(queue_dir)
+    meta = read_meta(connection)
+    units = connection.execute("SELECT id, file_id, status FROM units ORDER BY position").fetchall()
+    connection.close()
+
+    overall_true, overall_pred = [], []
+    file_results_dict, conf_matrix, accuracies = {}, {}, {}
+    missing = []
+    for unit_id, file_id, status in units:
+        output_path = result_path(queue_dir, unit_id)
+        if not os.path.exists(output_path):
+            missing.append((unit_id, status))
+            continue
+        with open(output_path, "r", encoding="utf-8") as json_file:
+            partial = json.load(json_file)
+        file_results = file_results_dict.setdefault(file_id, [])
+        row = conf_matrix.setdefault(file_id, {})
+        for sentence, expected_label, predicted_tag in partial["results"]:
+            file_results.append((sentence, expected_label, predicted_tag))
+            overall_true.append(expected_label)
+            overall_pred.append(predicted_tag)
+            row[predicted_tag] = row.get(predicted_tag, 0) + 1
+
+    for file_id, file_results in file_results_dict.items():
+        correct_predictions = sum(pred == true_lab for _, true_lab, pred in file_results)
+        accuracy = (correct_predictions / len(file_results)) * 100 if file_results else 0
+        accuracies[file_id] = {"accuracy": accuracy, "num_sentences": len(file_results)}
+
+    if missing:
+        print(f"Warning: {len(missing)} unit(s) have no result yet: {missing[:10]}")
+    model_name = meta["model_name"] if meta["tagset"] == "custom" else meta["tagset"]
+    save_reports(f"distributed_{model_name}", overall_true, overall_pred, accuracies, file_results_dict,
+                 conf_matrix, all_possible_tags=tagsets.possible_labels(meta["tagset"]), folder=folder)
+    return accuracies
+
+
+def run_local(queue_dir, n_workers, **init_kwargs):
+    """
+    Run the whole pipeline on one machine, with several local processes standing in for nodes.
+    """
+    init_queue(queue_dir, **init_kwargs)
+    workers = [
+        multiprocessing.Process(target=run_worker, args=(queue_dir, f"local-{i}")) for i in range(n_workers)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    print(f"Queue status: {queue_status(queue_dir)}")
+    return reduce_results(queue_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distributed 'that' evaluation over a SQLite work queue.")
+    parser.add_argument("--queue-dir", default=default_queue_dir, help="shared directory holding the queue")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    init_parser = subparsers.add_parser("init", help="split the test corpora into work units")
+    local_parser = subparsers.add_parser("local", help="init, run N local workers and reduce")
+    for sub in (init_parser, local_parser):
+        sub.add_argument("--model", default="our_model", help="Training/<model>.par (custom tagset)")
+        sub.add_argument("--tagset", default="custom", choices=sorted(tagsets.EXPECTED_LABELS))
+        sub.add_argument("--unit-size", type=int, default=UNIT_SIZE)
+        sub.add_argument("--reset", action="store_true", help="discard a queue created with other settings")
+    local_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    worker_parser = subparsers.add_parser("worker", help="claim and process units until the queue is empty")
+    worker_parser.add_argument("--worker-id")
+    subparsers.add_parser("status", help="show unit counts per status")
+    subparsers.add_parser("reduce", help="merge unit results into the Results/ reports")
+    args = parser.parse_args()
+
+    if args.command == "init":
+        init_queue(args.queue_dir, args.model, args.tagset, args.unit_size, reset=args.reset)
+        print(f"Queue status: {queue_status(args.queue_dir)}")
+    elif args.command == "worker":
+        print(f"Processed {run_worker(args.queue_dir, args.worker_id)} unit(s)")
+    elif args.command == "status":
+        print(queue_status(args.queue_dir))
+    elif args.command == "reduce":
+        reduce_results(args.queue_dir)
+    elif args.command == "local":
+        run_local(args.queue_dir, args.workers, model_name=args.model, tagset=args.tagset, unit_size=args.unit_size,
+                  reset=args.reset)
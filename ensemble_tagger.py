@@ -0,0 +1,183 @@
+import os
+import json
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import treetaggerwrapper
+
+import tagsets
+import corpus_io
+from train_models import file_hash
+from that_tagging import find_that_tag, evaluate_predictor, read_test_sentences, save_reports
+
+# Define folder paths
+training_folder = "Training"
+output_folder = "Results"
+calibration_folder = os.path.join("Data", "Test", "GUM")
+weights_path = os.path.join(output_folder, "ensemble_weights.json")
+
+# Held-out calibration set for the vote weights: the GUM gold "that" sentences (GUM_analysis/gum_index.py)
+calibration_configs = [
+    {
+        "id": f"gum_that_{category}",
+        "expected_label": tagsets.EXPECTED_LABELS["custom"][category],
+        "filepath": corpus_io.resolve_path(os.path.join(calibration_folder, f"gum_that_{category}.txt")),
+    }
+    for category in tagsets.CATEGORIES
+]
+
+# Specialized models plus the combined model
+ensemble_models = [
+    "adverb_model",
+    "conjunction_noun_model",
+    "conjunction_verb_model",
+    "determiner_model",
+    "pronoun_model",
+    "our_model",
+]
+
+
+def calibration_fingerprint(model_names, configs, folder=training_folder):
+    """
+    Hash the model files and the calibration files, so cached weights are recomputed when either changes.
+    """
+    paths = [os.path.join(folder, f"{name}.par") for name in model_names]
+    paths += [config["filepath"] for config in configs if os.path.exists(config["filepath"])]
+    return {path: file_hash(path) for path in paths if os.path.exists(path)}
+
+
+def calibrate_weights(predict_all, model_names, configs=calibration_configs, smoothing=1.0):
+    """
+    Estimate vote weights on held-out sentences (the GUM gold set, not the Data/Test files the ensemble
+    is scored on): weights[model][tag] is the model's smoothed precision for tag, i.e. how far the model
+    can be trusted when it predicts that tag. Tags a model never predicted get weight 0, and a model
+    whose prediction is the same for every calibration sentence carries no information and gets weight 0.
+    """
+    predicted = {name: defaultdict(int) for name in model_names}
+    correct = {name: defaultdict(int) for name in model_names}
+    n_sentences = 0
+    for config in configs:
+        if not os.path.exists(config["filepath"]):
+            continue
+        for sentence in read_test_sentences(config["filepath"]):
+            n_sentences += 1
+            for name, tag in predict_all(sentence).items():
+                predicted[name][tag] += 1
+                correct[name][tag] += tag == config["expected_label"]
+    if n_sentences == 0:
+        raise FileNotFoundError(
+            "No calibration sentences found; export the GUM gold set with GUM_analysis/gum_index.py first."
+        )
+
+    weights = {}
+    for name in model_names:
+        constant = len(predicted[name]) < 2
+        weights[name] = {
+            tag: 0.0 if constant else (correct[name][tag] + smoothing) / (count + 2 * smoothing)
+            for tag, count in predicted[name].items() if tag is not None
+        }
+    return weights
+
+
+class EnsembleTagger:
+    """
+    Tokenizes a sentence once, tags the tokens with every model concurrently (one TreeTagger process
+    per model) and combines their "that" predictions by majority or precision-weighted voting.
+    Only weighted voting is calibrated; models with a constant prediction on the calibration set
+    are left out of it.
+    """
+
+    def __init__(self, model_names=ensemble_models, vote="weighted", folder=training_folder):
+        self.model_names = list(model_names)
+        self.taggers = {
+            name: treetaggerwrapper.TreeTagger(TAGPARFILE=os.path.join(folder, f"{name}.par"))
+            for name in self.model_names
+        }
+        self.vote = vote
+        self.executor = ThreadPoolExecutor(max_workers=len(self.model_names))
+        self.weights = None
+        if vote == "weighted":
+            self.weights = self.load_weights()
+            self.report_informative_models()
+
+    def load_weights(self, path=weights_path, configs=calibration_configs):
+        """
+        Load the calibrated weights, recalibrating when the models or the calibration files changed.
+        """
+        fingerprint = calibration_fingerprint(self.model_names, configs)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as json_file:
+                cached = json.load(json_file)
+            if cached.get("fingerprint") == fingerprint:
+                return cached["weights"]
+        weights = calibrate_weights(self.predict_all, self.model_names, configs)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as json_file:
+            json.dump({"fingerprint": fingerprint, "weights": weights}, json_file, indent=4)
+        return weights
+
+    def informative(self, name):
+        return any(weight > 0 for weight in self.weights[name].values())
+
+    def report_informative_models(self):
+        """
+        Print the models dropped from the weighted vote, and warn when the vote reduces to a single model.
+        """
+        dropped = [name for name in self.model_names if not self.informative(name)]
+        if dropped:
+            print(f"Constant prediction on the calibration set, left out of the vote: {', '.join(dropped)}")
+        if len(self.model_names) - len(dropped) < 2:
+            print(f"Warning: only {len(self.model_names) - len(dropped)} informative model(s) remain; "
+                  f"the weighted vote is no better than a single model.")
+
+    def tokenize(self, sentence):
+        """
+        Run TreeTagger's tokenizer only (shared by all models).
+        """
+        return self.taggers[self.model_names[0]].tag_text(sentence, prepronly=True)
+
+    def predict_all(self, sentence):
+        """
+        Return the "that" tag predicted by every model for a sentence.
+        """
+        tokens = self.tokenize(sentence)
+        futures = {
+            name: self.executor.submit(tagger.tag_text, tokens, tagonly=True)
+            for name, tagger in self.taggers.items()
+        }
+        return {name: find_that_tag(future.result()) for name, future in futures.items()}
+
+    def combine(self, predictions):
+        """
+        Combine per-model predictions into a single tag (None when no model found "that").
+        """
+        scores = defaultdict(float)
+        for name, tag in predictions.items():
+            if tag is None:
+                continue
+            if self.vote == "weighted":
+                if self.informative(name):
+                    scores[tag] += self.weights[name].get(tag, 0.0)
+            else:
+                scores[tag] += 1.0
+        if not scores:
+            return None
+        return max(scores, key=scores.get)
+
+    def get_that_tag(self, sentence):
+        return self.combine(self.predict_all(sentence))
+
+    def close(self):
+        self.executor.shutdown()
+
+
+if __name__ == "__main__":
+    vote = sys.argv[1] if len(sys.argv) > 1 else "weighted"
+    ensemble = EnsembleTagger(vote=vote)
+    try:
+        results = evaluate_predictor(ensemble.get_that_tag)
+    finally:
+        ensemble.close()
+    save_reports(f"ensemble_{vote}", *results)
+    for file_id, stats in results[2].items():
+        print(f"{file_id}: {stats['accuracy']:.2f}% ({stats['num_sentences']} sentences)")
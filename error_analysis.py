@@ -0,0 +1,280 @@
+import os
+import re
+import sys
+import glob
+import json
+from collections import Counter
+import numpy as np
+
+import tagsets
+import corpus_io
+
+# Define folder paths
+results_folder = "Results"
+report_path = os.path.join(results_folder, "error_analysis.json")
+
+# Context features are taken from this many tokens on each side of the target token
+WINDOW = 3
+TOP_FEATURES = 10         # features reported per confusion cell
+MIN_SUPPORT = 2           # a feature must occur in at least this many errors of the cell
+SMOOTHING = 0.5           # additive smoothing of the log-odds ratio
+CLUSTER_THRESHOLD = 0.6   # cosine similarity above which two error contexts are linked
+BLOCK_ROWS = 1024         # rows of the similarity matrix computed at once
+
+# <model>_results_<file id>.txt[.gz|.xz|.zst] as written by that_tagging.save_reports
+# (the model prefix may be empty)
+results_pattern = re.compile(r"^(?P<model>.*?)_?results_(?P<file_id>.+?)\.txt(\.gz|\.xz|\.zst)?$")
+token_pattern = re.compile(r"\w+|[^\w\s]")
+
+
+def load_predictions(folder=results_folder):
+    """
+    Read every per-sentence results dump. Returns a list of (model, file id, sentence, true label, predicted tag).
+    """
+    records = []
+    # A dump written with several compressions is only read once, from its newest variant
+    dumps = {corpus_io.output_path(path, None) for path in glob.glob(os.path.join(folder, "*results_*.txt*"))}
+    for path in sorted(corpus_io.resolve_path(dump) for dump in dumps):
+        match = results_pattern.match(os.path.basename(path))
+        if not match or match["file_id"] not in tagsets.TEST_FILE_CATEGORIES:
+            continue
+        model = match["model"] or "default"
+        with corpus_io.open_text(path) as results_file:
+            lines = results_file.read().splitlines()[2:]  # skip the header and the dashes
+        for line in lines:
+            parts = line.rsplit(" | ", 2)
+            if len(parts) == 3:
+                records.append((model, match["file_id"], parts[0].strip(), parts[1].strip(), parts[2].strip()))
+    return records
+
+
+def context_features(sentence, target="that", window=WINDOW):
+    """
+    Positional unigrams and bigrams around the first target token, plus a bag of words of the window.
+    Sentence boundaries are padded with <s> / </s>.
+    """
+    tokens = [token.lower() for token in token_pattern.findall(sentence)]
+    if target not in tokens:
+        return ["NO_TARGET"]
+    index = tokens.index(target)
+    padded = ["<s>"] * window + tokens + ["</s>"] * window
+    center = index + window
+    left = padded[center - window:center]
+    right = padded[center + 1:center + window + 1]
+
+    features = []
+    for offset in range(1, window + 1):
+        features.append(f"L{offset}={left[-offset]}")
+        features.append(f"R{offset}={right[offset - 1]}")
+    features.append(f"L2L1={left[-2]}_{left[-1]}")
+    features.append(f"L1R1={left[-1]}_{right[0]}")
+    features.append(f"R1R2={right[0]}_{right[1]}")
+    features.extend(f"W={word}" for word in left + right if word not in ("<s>", "</s>"))
+    return list(dict.fromkeys(features))  # binary features: each counted once per sentence
+
+
+def build_context_matrix(sentences):
+    """
+    Sparse CSR (indptr, indices) binary matrix of sentences x context features, and the feature names.
+    """
+    feature_ids = {}
+    indptr, indices = [0], []
+    for sentence in sentences:
+        for feature in context_features(sentence):
+            indices.append(feature_ids.setdefault(feature, len(feature_ids)))
+        indptr.append(len(indices))
+    feature_names = np.empty(len(feature_ids), dtype=object)
+    for feature, i in feature_ids.items():
+        feature_names[i] = feature
+    return np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int64), feature_names
+
+
+def expand_rows(indptr, indices, rows):
+    """
+    Gather the non-zeros of the given CSR rows at once.
+    Returns (feature ids, position in rows of each non-zero).
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    lengths = indptr[rows + 1] - indptr[rows]
+    owner = np.repeat(np.arange(len(rows)), lengths)
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return indices[np.repeat(indptr[rows], lengths) + offsets], owner
+
+
+def count_group_features(features, owner, record_groups, n_features):
+    """
+    Count feature occurrences per group in one pass. Records with group -1 are ignored.
+    Returns sorted keys (group * n_features + feature) and their counts.
+    """
+    groups = record_groups[owner]
+    keep = groups >= 0
+    return np.unique(groups[keep] * n_features + features[keep], return_counts=True)
+
+
+def confusion_features(records, indptr, indices, feature_names, sentence_rows, top=TOP_FEATURES):
+    """
+    For every confusion cell (model, true label, predicted tag), rank the context features by their
+    smoothed log-odds ratio between the cell's errors and all other sentences tagged by the same model.
+    All cells of all models are scored together from sparse counts.
+    """
+    n_features = len(feature_names)
+    cell_ids, model_ids = {}, {}
+    record_cells = np.full(len(records), -1, dtype=np.int64)
+    record_models = np.empty(len(records), dtype=np.int64)
+    for i, (model, _, _, true_label, predicted) in enumerate(records):
+        record_models[i] = model_ids.setdefault(model, len(model_ids))
+        if predicted != true_label:
+            record_cells[i] = cell_ids.setdefault((model, true_label, predicted), len(cell_ids))
+    if not cell_ids:
+        return {}
+    cell_models = np.array([model_ids[model] for model, _, _ in cell_ids], dtype=np.int64)
+    cell_sizes = np.bincount(record_cells[record_cells >= 0], minlength=len(cell_ids))
+    model_sizes = np.bincount(record_models, minlength=len(model_ids))
+
+    features, owner = expand_rows(indptr, indices, sentence_rows)
+    cell_keys, cell_counts = count_group_features(features, owner, record_cells, n_features)
+    model_keys, model_counts = count_group_features(features, owner, record_models, n_features)
+
+    # Every (cell, feature) pair also occurs in the cell's model, so the lookup always succeeds
+    pair_cells, pair_features = cell_keys // n_features, cell_keys % n_features
+    in_model = model_counts[np.searchsorted(model_keys, cell_models[pair_cells] * n_features + pair_features)]
+    errors, n_errors = cell_counts, cell_sizes[pair_cells]
+    reference = in_model - errors
+    n_reference = model_sizes[cell_models[pair_cells]] - n_errors
+    log_odds = (np.log((errors + SMOOTHING) / (n_errors - errors + SMOOTHING))
+                - np.log((reference + SMOOTHING) / (n_reference - reference + SMOOTHING)))
+
+    # Top features per cell: sort by (cell, -score) and keep the first `top` supported ones of each cell
+    supported = np.flatnonzero(errors >= MIN_SUPPORT)
+    order = supported[np.lexsort((-log_odds[supported], pair_cells[supported]))]
+    cells_in_order = pair_cells[order]
+    first = np.searchsorted(cells_in_order, cells_in_order, side="left")
+    order = order[np.arange(len(order)) - first < top]
+
+    report = {}
+    for (model, true_label, predicted), cell in cell_ids.items():
+        report.setdefault(model, {})[f"{true_label}->{predicted}"] = {
+            "errors": int(cell_sizes[cell]),
+            "reference_sentences": int(model_sizes[cell_models[cell]] - cell_sizes[cell]),
+            "features": [],
+        }
+    cells = list(cell_ids)
+    for pair in order:
+        model, true_label, predicted = cells[pair_cells[pair]]
+        report[model][f"{true_label}->{predicted}"]["features"].append({
+            "feature": feature_names[pair_features[pair]],
+            "in_errors": int(errors[pair]),
+            "in_reference": int(reference[pair]),
+            "log_odds": round(float(log_odds[pair]), 3),
+        })
+    return report
+
+
+def cluster_errors(records, indptr, indices, feature_names, sentence_rows, threshold=CLUSTER_THRESHOLD):
+    """
+    Cluster the misclassified sentences of all models by the cosine similarity of their context features
+    (the positional features shared by at least two errors). The vectors stay sparse: co-occurrence counts
+    of a block of rows are gathered from a feature -> error postings list, so only that block of the
+    similarity matrix is ever dense. Clusters are grown greedily around the sentence with the most
+    unassigned neighbours, so similarity does not chain.
+    """
+    is_error = np.array([predicted != true_label for _, _, _, true_label, predicted in records], dtype=bool)
+    error_rows = np.unique(sentence_rows[is_error])
+    n_errors = len(error_rows)
+    if n_errors == 0:
+        return []
+
+    features, owner = expand_rows(indptr, indices, error_rows)
+    document_frequency = np.bincount(features, minlength=len(feature_names))
+    positional = np.array([not name.startswith("W=") for name in feature_names], dtype=bool)
+    keep = ((document_frequency >= 2) & positional)[features]
+    # Binary CSR rows (error x feature id) and the transposed postings (feature id -> errors)
+    row_features, row_owner = features[keep], owner[keep]
+    row_indptr = np.concatenate([[0], np.cumsum(np.bincount(row_owner, minlength=n_errors))])
+    postings = row_owner[np.argsort(row_features, kind="stable")]
+    postings_indptr = np.concatenate([[0], np.cumsum(np.bincount(row_features, minlength=len(feature_names)))])
+    # Cosine of binary vectors: co-occurrences / sqrt(n_i * n_j); rows without features match nothing
+    lengths = np.diff(row_indptr)
+    inverse_norms = np.where(lengths > 0, 1.0 / np.sqrt(np.maximum(lengths, 1)), 0.0)
+
+    neighbours = []
+    for start in range(0, n_errors, BLOCK_ROWS):
+        stop = min(start + BLOCK_ROWS, n_errors)
+        block = slice(row_indptr[start], row_indptr[stop])
+        others, pair = expand_rows(postings_indptr, postings, row_features[block])
+        cooccurrences = np.bincount((row_owner[block][pair] - start) * n_errors + others,
+                                    minlength=(stop - start) * n_errors).reshape(stop - start, n_errors)
+        similarity = cooccurrences * inverse_norms[start:stop, None] * inverse_norms[None, :]
+        neighbours.extend(np.flatnonzero(row >= threshold) for row in similarity)
+    centers = np.full(n_errors, -1, dtype=np.int64)
+    for i in np.argsort([-len(row) for row in neighbours], kind="stable"):
+        if centers[i] < 0:
+            members = neighbours[i][centers[neighbours[i]] < 0]
+            centers[members] = i
+            centers[i] = i
+
+    # Errors of every model on each error sentence
+    row_position = {row: i for i, row in enumerate(error_rows.tolist())}
+    confusions = [[] for _ in error_rows]
+    for record, row in zip(records, sentence_rows.tolist()):
+        model, _, sentence, true_label, predicted = record
+        if predicted != true_label:
+            confusions[row_position[row]].append((model, true_label, predicted, sentence))
+
+    clusters = []
+    for center in np.unique(centers):
+        members = np.flatnonzero(centers == center)
+        if len(members) < 2:
+            continue
+        member_errors = [error for i in members for error in confusions[i]]
+        member_features, _ = expand_rows(row_indptr, row_features, members)
+        frequency = np.bincount(member_features, minlength=len(feature_names)) / len(members)
+        common = np.argsort(-frequency, kind="stable")[:TOP_FEATURES]
+        clusters.append({
+            "sentences": int(len(members)),
+            "errors": len(member_errors),
+            "confusions": dict(Counter(
+                f"{true_label}->{predicted}" for _, true_label, predicted, _ in member_errors
+            ).most_common()),
+            "models": dict(Counter(model for model, _, _, _ in member_errors).most_common()),
+            "common_features": [feature_names[i] for i in common if frequency[i] >= 0.5],
+            "examples": list(dict.fromkeys(sentence for _, _, _, sentence in member_errors))[:5],
+        })
+    clusters.sort(key=lambda cluster: -cluster["errors"])
+    return clusters
+
+
+def analyze_errors(folder=results_folder, threshold=CLUSTER_THRESHOLD):
+    """
+    Run the whole error analysis over every model and test file found in the Results folder.
+    """
+    records = load_predictions(folder)
+    sentences, sentence_rows = np.unique(np.array([record[2] for record in records], dtype=object), return_inverse=True)
+    indptr, indices, feature_names = build_context_matrix(sentences)
+
+    per_model = {}
+    for model, _, _, true_label, predicted in records:
+        stats = per_model.setdefault(model, {"sentences": 0, "errors": 0})
+        stats["sentences"] += 1
+        stats["errors"] += predicted != true_label
+    return {
+        "models": per_model,
+        "confusion_features": confusion_features(records, indptr, indices, feature_names, sentence_rows),
+        "clusters": cluster_errors(records, indptr, indices, feature_names, sentence_rows, threshold),
+    }
+
+
+def save_report(report, path=report_path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as json_file:
+        json.dump(report, json_file, indent=4, ensure_ascii=False)
+    print(f"Error Analysis Report saved in {path}")
+
+
+if __name__ == "__main__":
+    folder = sys.argv[1] if len(sys.argv) > 1 else results_folder
+    report = analyze_errors(folder)
+    for model, stats in report["models"].items():
+        print(f"{model}: {stats['errors']} errors in {stats['sentences']} sentences")
+    print(f"Error clusters: {len(report['clusters'])}")
+    save_report(report, os.path.join(folder, "error_analysis.json"))
@@ -0,0 +1,61 @@
+import os
+import json
+
+import tagsets
+from that_tagging import file_configs, get_that_tag, read_test_sentences
+
+# Define folder paths
+training_folder = "Training"
+output_folder = "Results"
+report_path = os.path.join(output_folder, "multi_tagset_report.json")
+
+# One tagger per tagset (same models as evaluation_bnc.py, evaluation_penn.py and our_model_evaluation.py)
+tagger_settings = {
+    "bnc": {"TAGPARFILE": "/home/abdelhaq/treetagger/lib/english-bnc.par"},
+    "penn": {"TAGLANG": "en"},
+    "custom": {"TAGPARFILE": os.path.join(training_folder, "our_model.par")},
+}
+
+
+def normalize_tag(tagset, tag):
+    """
+    Penn tags may come as e.g. "IN/that", so keep the part before the "/" (as evaluation_penn.py does).
+    """
+    if tag is not None and tagset == "penn":
+        return tag.split("/")[0]
+    return tag
+
+
+def evaluate_all_tagsets(settings=tagger_settings, configs=file_configs):
+    """
+    Read every test sentence once, tag it with the BNC, Penn and custom models and score all
+    three outputs against the single gold standard (the category of each test file).
+    """
+    import treetaggerwrapper
+    taggers = {tagset: treetaggerwrapper.TreeTagger(**kwargs) for tagset, kwargs in settings.items()}
+    gold_file_ids = []
+    predictions = {tagset: [] for tagset in taggers}
+
+    for config in configs:
+        if not os.path.exists(config["filepath"]):
+            print(f"File {config['filepath']} not found.")
+            continue
+        for sentence in read_test_sentences(config["filepath"]):
+            gold_file_ids.append(config["id"])
+            for tagset, tagger in taggers.items():
+                predictions[tagset].append(normalize_tag(tagset, get_that_tag(tagger, sentence)))
+
+    gold = tagsets.encode_categories(gold_file_ids)
+    encoded = {tagset: tagsets.vocabulary.encode(labels) for tagset, labels in predictions.items()}
+    return tagsets.score(gold, encoded)
+
+
+if __name__ == "__main__":
+    report = evaluate_all_tagsets()
+    for tagset, stats in report.items():
+        print(f"{tagset}: {stats['accuracy']:.2f}%")
+
+    os.makedirs(output_folder, exist_ok=True)
+    with open(report_path, "w", encoding="utf-8") as json_file:
+        json.dump(report, json_file, indent=4)
+    print(f"Multi-tagset Report saved in {report_path}")
@@ -0,0 +1,248 @@
+import os
+import re
+import sys
+import json
+import time
+import zlib
+from collections import Counter, defaultdict
+import numpy as np
+
+import corpus_io
+from that_tagging import file_configs, get_that_tag, read_test_sentences
+
+# Define folder paths
+training_folder = "Training"
+output_folder = "Results"
+train_path = corpus_io.resolve_path(os.path.join(training_folder, "train.txt"))
+model_path = os.path.join(training_folder, "fast_that_model.npz")
+report_path = os.path.join(output_folder, "fast_that_report.json")
+
+# Number of hashed feature buckets (the model is a n_classes x N_FEATURES array)
+N_FEATURES = 1 << 16
+
+# Simple word/punctuation tokenizer (close to word_tokenize on our data, e.g. "didn ’ t")
+token_pattern = re.compile(r"\w+|[^\w\s]")
+
+
+def tokenize(sentence):
+    return [token.lower() for token in token_pattern.findall(sentence)]
+
+
+def read_tagged_sentences(path=train_path):
+    """
+    Read a TreeTagger training file (word<TAB>tag, blank line between sentences).
+    """
+    sentences = [[]]
+    with corpus_io.open_text(path) as infile:
+        for line in infile:
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) < 2:
+                if sentences[-1]:
+                    sentences.append([])
+                continue
+            sentences[-1].append((parts[0].lower(), parts[1]))
+    return [sentence for sentence in sentences if sentence]
+
+
+def build_tag_lexicon(tagged_sentences):
+    """
+    Most frequent training tag of every word, used as a cheap stand-in for the neighbours' tags.
+    """
+    counts = defaultdict(Counter)
+    for sentence in tagged_sentences:
+        for word, tag in sentence:
+            if word != "that":
+                counts[word][tag] += 1
+    return {word: tag_counts.most_common(1)[0][0] for word, tag_counts in counts.items()}
+
+
+def context_features(words, index, tag_lexicon):
+    """
+    Context features of the target at words[index]: neighbouring words and their lexicon tags
+    in a +/-2 window, plus a few conjunctions of them.
+    """
+    def word_at(i):
+        return words[i] if 0 <= i < len(words) else ("<s>" if i < 0 else "</s>")
+
+    def tag_at(i):
+        return tag_lexicon.get(word_at(i), "UNK")
+
+    return [
+        "bias",
+        f"w-1={word_at(index - 1)}",
+        f"w-2={word_at(index - 2)}",
+        f"w+1={word_at(index + 1)}",
+        f"w+2={word_at(index + 2)}",
+        f"t-1={tag_at(index - 1)}",
+        f"t-2={tag_at(index - 2)}",
+        f"t+1={tag_at(index + 1)}",
+        f"t+2={tag_at(index + 2)}",
+        f"w-1,w+1={word_at(index - 1)},{word_at(index + 1)}",
+        f"t-1,t+1={tag_at(index - 1)},{tag_at(index + 1)}",
+        f"w+1,w+2={word_at(index + 1)},{word_at(index + 2)}",
+    ]
+
+
+def hash_features(features):
+    return np.array([zlib.crc32(feature.encode("utf-8")) % N_FEATURES for feature in features], dtype=np.int64)
+
+
+def train(path=train_path, alpha=0.1):
+    """
+    Train a hashed multinomial naive Bayes model of the "that" tag from the training file.
+    Returns the model as a dict of arrays plus the class labels and the tag lexicon.
+    """
+    tagged_sentences = read_tagged_sentences(path)
+    tag_lexicon = build_tag_lexicon(tagged_sentences)
+
+    labels = sorted({tag for sentence in tagged_sentences for word, tag in sentence if word == "that"})
+    label_index = {label: i for i, label in enumerate(labels)}
+    counts = np.zeros((len(labels), N_FEATURES), dtype=np.float64)
+    priors = np.zeros(len(labels), dtype=np.float64)
+
+    for sentence in tagged_sentences:
+        words = [word for word, _ in sentence]
+        for index, (word, tag) in enumerate(sentence):
+            if word != "that":
+                continue
+            priors[label_index[tag]] += 1
+            np.add.at(counts[label_index[tag]], hash_features(context_features(words, index, tag_lexicon)), 1)
+
+    log_likelihood = np.log(counts + alpha) - np.log(counts.sum(axis=1, keepdims=True) + alpha * N_FEATURES)
+    return {
+        "labels": labels,
+        "log_prior": np.log(priors / priors.sum()),
+        "log_likelihood": log_likelihood.astype(np.float32),
+        "tag_lexicon": tag_lexicon,
+    }
+
+
+def save_model(model, path=model_path):
+    np.savez_compressed(
+        path,
+        labels=np.array(model["labels"]),
+        log_prior=model["log_prior"],
+        log_likelihood=model["log_likelihood"],
+        lexicon_words=np.array(list(model["tag_lexicon"].keys())),
+        lexicon_tags=np.array(list(model["tag_lexicon"].values())),
+    )
+
+
+def load_model(path=model_path):
+    with np.load(path) as data:
+        return {
+            "labels": data["labels"].tolist(),
+            "log_prior": data["log_prior"],
+            "log_likelihood": data["log_likelihood"],
+            "tag_lexicon": dict(zip(data["lexicon_words"].tolist(), data["lexicon_tags"].tolist())),
+        }
+
+
+class FastThatClassifier:
+    """
+    Array-backed classifier for the tag of the first "that" in a sentence.
+    predict() returns (tag, confidence), or (None, 0.0) when the sentence has no "that".
+    """
+
+    def __init__(self, model):
+        self.labels = model["labels"]
+        self.log_prior = model["log_prior"]
+        self.log_likelihood = model["log_likelihood"]
+        self.tag_lexicon = model["tag_lexicon"]
+
+    def predict(self, sentence):
+        words = tokenize(sentence)
+        if "that" not in words:
+            return None, 0.0
+        features = hash_features(context_features(words, words.index("that"), self.tag_lexicon))
+        scores = self.log_prior + self.log_likelihood[:, features].sum(axis=1)
+        probabilities = np.exp(scores - scores.max())
+        probabilities /= probabilities.sum()
+        best = int(probabilities.argmax())
+        return self.labels[best], float(probabilities[best])
+
+
+class CascadeTagger:
+    """
+    Resolve confident sentences with the fast classifier and fall back to a TreeTagger .par model
+    (started lazily, on the first low-confidence sentence) otherwise.
+    """
+
+    def __init__(self, classifier, threshold=0.9, fallback_model=os.path.join(training_folder, "our_model.par")):
+        self.classifier = classifier
+        self.threshold = threshold
+        self.fallback_model = fallback_model
+        self.tagger = None
+
+    def get_that_tag(self, sentence):
+        """
+        Returns (tag, resolved by the fast path).
+        """
+        tag, confidence = self.classifier.predict(sentence)
+        if tag is not None and confidence >= self.threshold:
+            return tag, True
+        if self.tagger is None:
+            import treetaggerwrapper
+            self.tagger = treetaggerwrapper.TreeTagger(TAGPARFILE=self.fallback_model)
+        return get_that_tag(self.tagger, sentence), False
+
+
+def evaluate_cascade(cascade, configs=file_configs):
+    """
+    Report the fraction of sentences resolved by the fast path, the latency of both paths
+    and the accuracy (overall and per path) against Data/Test.
+    """
+    stats = {"fast": {"count": 0, "correct": 0, "time": 0.0}, "fallback": {"count": 0, "correct": 0, "time": 0.0}}
+    per_file = {}
+    for config in configs:
+        if not os.path.exists(config["filepath"]):
+            continue
+        correct = 0
+        sentences = read_test_sentences(config["filepath"])
+        for sentence in sentences:
+            start = time.perf_counter()
+            tag, resolved = cascade.get_that_tag(sentence)
+            elapsed = time.perf_counter() - start
+            path = stats["fast" if resolved else "fallback"]
+            path["count"] += 1
+            path["time"] += elapsed
+            path["correct"] += tag == config["expected_label"]
+            correct += tag == config["expected_label"]
+        per_file[config["id"]] = {
+            "accuracy": (correct / len(sentences)) * 100 if sentences else 0,
+            "num_sentences": len(sentences),
+        }
+
+    total = stats["fast"]["count"] + stats["fallback"]["count"]
+    report = {"threshold": cascade.threshold, "num_sentences": total, "files": per_file}
+    report["resolved_fraction"] = stats["fast"]["count"] / total if total else 0.0
+    report["accuracy"] = ((stats["fast"]["correct"] + stats["fallback"]["correct"]) / total) * 100 if total else 0.0
+    for name, path in stats.items():
+        report[name] = {
+            "count": path["count"],
+            "accuracy": (path["correct"] / path["count"]) * 100 if path["count"] else 0.0,
+            "mean_latency_us": (path["time"] / path["count"]) * 1e6 if path["count"] else 0.0,
+        }
+    return report
+
+
+if __name__ == "__main__":
+    threshold = float(sys.argv[1]) if len(sys.argv) > 1 else 0.9
+    if os.path.exists(model_path) and os.path.getmtime(model_path) >= os.path.getmtime(train_path):
+        model = load_model()
+    else:
+        model = train()
+        save_model(model)
+        print(f"Fast classifier saved in {model_path}")
+
+    report = evaluate_cascade(CascadeTagger(FastThatClassifier(model), threshold=threshold))
+    print(f"Resolved by the fast path: {report['resolved_fraction'] * 100:.1f}% "
+          f"({report['fast']['mean_latency_us']:.0f} us/sentence, accuracy {report['fast']['accuracy']:.2f}%)")
+    print(f"TreeTagger fallback: {report['fallback']['count']} sentences "
+          f"({report['fallback']['mean_latency_us']:.0f} us/sentence, accuracy {report['fallback']['accuracy']:.2f}%)")
+    print(f"Overall accuracy: {report['accuracy']:.2f}%")
+
+    os.makedirs(output_folder, exist_ok=True)
+    with open(report_path, "w", encoding="utf-8") as json_file:
+        json.dump(report, json_file, indent=4)
+    print(f"Fast classifier Report saved in {report_path}")
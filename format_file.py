@@ -1,11 +1,14 @@
 import os
 
+import corpus_io
+
 def transform_file(input_file, output_dir):
     # Extract the base file name (without path and extension) to create a formatted file name
-    base_name = os.path.basename(input_file).replace('.txt', '_formatted.txt')
-    output_file = os.path.join(output_dir, base_name)  # Full path for the output file
+    base_name = os.path.basename(corpus_io.output_path(input_file, None)).replace('.txt', '_formatted.txt')
+    output_file = corpus_io.output_path(os.path.join(output_dir, base_name))  # Full path for the output file
 
-    with open(input_file, 'r') as infile, open(output_file, 'w') as outfile:
+    input_file = corpus_io.resolve_path(input_file)
+    with corpus_io.open_text(input_file) as infile, corpus_io.open_text(output_file, 'w') as outfile:
         for line in infile:
             # Split the line into words and tags
             tokens_tags = line.strip().split()
@@ -48,5 +51,9 @@ training_files = [
 # Path for the output formatted files
 output_dir = 'dataset/formatted_train_files_claws8/'
 
-# Process all files
-process_all_files(training_files, output_dir)
+def main():
+    # Process all files
+    process_all_files(training_files, output_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+import treetaggerwrapper
+from sklearn.metrics import classification_report
+
+from train_models import train_model, spec_fingerprint, default_options, file_hash
+from that_tagging import file_configs, get_that_tag, read_test_sentences
+
+# Define folder paths
+training_folder = "Training"
+sweep_folder = "sweep"  # relative to the Training folder
+output_folder = "Results"
+cache_folder = os.path.join(output_folder, "sweep_cache")
+leaderboard_path = os.path.join(output_folder, "sweep_leaderboard.csv")
+
+# Default search space over train-tree-tagger options:
+# -cl context length, -dtg decision tree gain threshold,
+# -ecw equivalence class weight, -atg affix tree gain threshold.
+search_space = {
+    "-cl": [1, 2, 3],
+    "-dtg": [0.3, 0.5, 0.7, 1.0],
+    "-ecw": [0.15, 0.3, 0.5],
+    "-atg": [1.0, 1.2, 1.5],
+}
+
+
+def grid_configs(space):
+    """
+    Enumerate every combination of the search space.
+    """
+    keys = sorted(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[key] for key in keys))]
+
+
+def random_configs(space, n, seed=0):
+    """
+    Draw n distinct random configurations from the search space.
+    """
+    grid = grid_configs(space)
+    return random.Random(seed).sample(grid, min(n, len(grid)))
+
+
+def config_options(config):
+    """
+    Turn a configuration into a train-tree-tagger option list.
+    """
+    options = list(default_options)
+    for key in sorted(config):
+        options += [key, str(config[key])]
+    return options
+
+
+def test_sentences(configs=file_configs):
+    """
+    Read the (expected label, sentence) pairs of every test file.
+    """
+    pairs = []
+    for config in configs:
+        if not os.path.exists(config["filepath"]):
+            continue
+        pairs.extend((config["expected_label"], sentence) for sentence in read_test_sentences(config["filepath"]))
+    return pairs
+
+
+def test_set_hashes(configs=file_configs):
+    """
+    Hash every test file so cached accuracies are invalidated when Data/Test changes.
+    """
+    return {config["id"]: file_hash(config["filepath"]) for config in configs if os.path.exists(config["filepath"])}
+
+
+def evaluate_model(model_path):
+    """
+    Tag every test file with a model and return accuracy and macro F1.
+    """
+    tagger = treetaggerwrapper.TreeTagger(TAGPARFILE=model_path)
+    pairs = test_sentences()
+    overall_true = [expected_label for expected_label, _ in pairs]
+    # Missing "that" predictions are counted as their own label, as in the evaluation scripts
+    overall_pred = [str(get_that_tag(tagger, sentence)) for _, sentence in pairs]
+
+    class_report = classification_report(overall_true, overall_pred, output_dict=True, zero_division=0)
+    return {
+        "accuracy": class_report["accuracy"] * 100,
+        "macro_f1": class_report["macro avg"]["f1-score"],
+        "num_sentences": len(overall_true),
+    }
+
+
+def measure_throughput(model_path):
+    """
+    Tagging throughput (sentences/s) of a model over the test files.
+    Called serially after training so the timing is not disturbed by concurrent configurations.
+    """
+    tagger = treetaggerwrapper.TreeTagger(TAGPARFILE=model_path)
+    sentences = [sentence for _, sentence in test_sentences()]
+    start = time.perf_counter()
+    for sentence in sentences:
+        get_that_tag(tagger, sentence)
+    elapsed = time.perf_counter() - start
+    return len(sentences) / elapsed if elapsed > 0 else 0.0
+
+
+def save_cache_entry(result):
+    """
+    Write a cache entry atomically so an interrupted sweep never leaves a partial result.
+    """
+    cache_path = os.path.join(cache_folder, f"{result['fingerprint']}.json")
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as json_file:
+        json.dump(result, json_file, indent=4)
+    os.replace(tmp_path, cache_path)
+
+
+def run_config(config, train_file="train.txt"):
+    """
+    Train one configuration and evaluate its accuracy, reusing the cached result of a previous run
+    when the (config, training input hashes, test file hashes) fingerprint is unchanged.
+    The result is cached as soon as the model is evaluated, with its "model_path" and no throughput yet,
+    so an interrupted sweep resumes without retraining it.
+    """
+    options = config_options(config)
+    spec = {"name": "sweep", "train_file": train_file}
+    training_fingerprint, _ = spec_fingerprint(spec, options, training_folder)
+    fingerprint = hashlib.sha256(
+        json.dumps({"training": training_fingerprint, "test": test_set_hashes()}, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    cache_path = os.path.join(cache_folder, f"{fingerprint}.json")
+    if os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as json_file:
+            cached = json.load(json_file)
+        # An untimed entry whose model is gone cannot be completed and is retrained
+        if cached.get("throughput") is not None or os.path.exists(cached.get("model_path", "")):
+            return cached
+
+    spec["output"] = os.path.join(sweep_folder, f"sweep_{fingerprint[:16]}.par")
+    model_path = os.path.join(training_folder, spec["output"])
+    record = train_model(spec, options=options, folder=training_folder)
+    result = {"config": config, "fingerprint": fingerprint, "training_time": record["training_time"],
+              "model_size": record["model_size"], **evaluate_model(model_path),
+              "model_path": model_path, "throughput": None}
+    save_cache_entry(result)
+    return result
+
+
+def run_sweep(configs, max_workers=4, keep_models=False):
+    """
+    Train and evaluate configurations concurrently with a bounded number of workers, then time the new
+    models one at a time, and return the leaderboard (best accuracy first, then throughput, then smaller models).
+    """
+    os.makedirs(cache_folder, exist_ok=True)
+    os.makedirs(os.path.join(training_folder, sweep_folder), exist_ok=True)
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run_config, config): config for config in configs}
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except Exception as error:
+                print(f"Configuration {futures[future]} failed: {error}")
+
+    # Dedicated timing pass: nothing else trains or tags while a model is timed.
+    # It also completes the entries cached by a sweep interrupted before its timing pass.
+    for result in results:
+        if result.get("throughput") is None:
+            try:
+                result["throughput"] = measure_throughput(result["model_path"])
+            except Exception as error:
+                print(f"Timing configuration {result['config']} failed: {error}")
+                continue
+            save_cache_entry(result)
+            if not keep_models:
+                os.remove(result["model_path"])
+        print(f"{result['config']}: accuracy {result['accuracy']:.2f}%, "
+              f"{result['throughput']:.1f} sentences/s, {result['model_size']} bytes")
+
+    rows = [{**{key.lstrip("-"): value for key, value in result["config"].items()},
+             **{key: value for key, value in result.items() if key not in ("config", "fingerprint", "model_path")}}
+            for result in results if result.get("throughput") is not None]
+    leaderboard = pd.DataFrame(rows)
+    if not leaderboard.empty:
+        leaderboard = leaderboard.sort_values(
+            ["accuracy", "throughput", "model_size"], ascending=[False, False, True]
+        ).reset_index(drop=True)
+    return leaderboard
+
+
+if __name__ == "__main__":
+    # Usage: python hyperparameter_sweep.py [grid | random N] [max_workers]
+    mode = sys.argv[1] if len(sys.argv) > 1 else "grid"
+    if mode == "random":
+        configs = random_configs(search_space, int(sys.argv[2]) if len(sys.argv) > 2 else 10)
+        max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    else:
+        configs = grid_configs(search_space)
+        max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    leaderboard = run_sweep(configs, max_workers=max_workers)
+    leaderboard.to_csv(leaderboard_path, index=False)
+    print(f"Sweep Leaderboard saved in {leaderboard_path}")
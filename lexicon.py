@@ -1,11 +1,8 @@
-import nltk
 from nltk.corpus import wordnet
 from nltk.stem import WordNetLemmatizer
 
-# Download necessary NLTK data files if not already present
-nltk.download('punkt')
-nltk.download('wordnet')
-nltk.download('omw-1.4')
+import corpus_io
+from nltk_resources import ensure_nltk_resources
 
 # Initialize the NLTK lemmatizer
 lemmatizer = WordNetLemmatizer()
@@ -39,7 +36,7 @@ def create_lexicon(training_files):
 
     # Iterate through each training file
     for file_name in training_files:
-        with open(file_name, 'r') as file:
+        with corpus_io.open_text(corpus_io.resolve_path(file_name)) as file:
             for line in file:
                 # Split each line into token and POS tag
                 tokens_tags = line.strip().split()
@@ -62,7 +59,7 @@ def create_lexicon(training_files):
 
 # Function to write the lexicon to a file
 def write_lexicon_to_file(lexicon, output_file):
-    with open(output_file, 'w') as file:
+    with corpus_io.open_text(output_file, 'w') as file:
         for token, tags in lexicon.items():
             for tag_lemma in tags:
                 file.write(f"{token} {tag_lemma}\n")
@@ -76,13 +73,20 @@ training_files = [
     'dataset/formatted_train_files_claws8/pronoun_formatted.txt'
 ]
 
-# Output lexicon file name
-output_file = 'dataset/lexicon.txt'
+# Output lexicon file name (compressed when CORPUS_COMPRESSION is set)
+output_file = corpus_io.output_path('dataset/lexicon.txt')
 
-# Generate the lexicon
-lexicon = create_lexicon(training_files)
+def main():
+    # Make sure the necessary NLTK data files are present (checked offline against the local cache)
+    ensure_nltk_resources('punkt', 'wordnet', 'omw-1.4')
 
-# Write the lexicon to a file
-write_lexicon_to_file(lexicon, output_file)
+    # Generate the lexicon
+    lexicon = create_lexicon(training_files)
 
-print(f"Lexicon file '{output_file}' has been created successfully!")
+    # Write the lexicon to a file
+    write_lexicon_to_file(lexicon, output_file)
+
+    print(f"Lexicon file '{output_file}' has been created successfully!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import os
+import sys
+import json
+from collections import Counter, deque
+import treetaggerwrapper
+
+from corpus_reader import CorpusReader
+from that_tagging import file_configs, tag_batch, find_target_tags
+
+# Define folder paths
+training_folder = "Training"
+output_folder = "Results"
+occurrences_path = os.path.join(output_folder, "multi_target_occurrences.tsv")
+report_path = os.path.join(output_folder, "multi_target_report.json")
+
+# Ambiguous function words evaluated together
+default_targets = ["that", "as", "so", "like"]
+
+# Sentences sent to TreeTagger per call
+BATCH_SIZE = 64
+
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher: finds every occurrence of any pattern in one left-to-right pass over the text.
+    """
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for pattern in patterns:
+            state = 0
+            for char in pattern:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].append(pattern)
+
+        # Breadth-first construction of the failure links
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def search(self, text):
+        """
+        Yield (start, pattern) for every match in text.
+        """
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for pattern in self.output[state]:
+                yield i - len(pattern) + 1, pattern
+
+
+def contains_target(matcher, sentence):
+    """
+    Pre-scan: True if the sentence contains a target as a whole word (case insensitive).
+    """
+    text = sentence.lower()
+    for start, pattern in matcher.search(text):
+        end = start + len(pattern)
+        if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+            return True
+    return False
+
+
+def evaluate_targets(tagger, targets=default_targets, configs=file_configs, gold_target="that"):
+    """
+    Scan every test file once: only lines that contain a target go to TreeTagger (in batches),
+    and every target occurrence is reported with its token position. The gold label of a file
+    (config["expected_label"]) grades the first occurrence of gold_target in each sentence.
+    """
+    targets = [target.lower() for target in targets]
+    target_set = set(targets)
+    matcher = AhoCorasick(targets)
+    occurrences = []
+    stats = {"lines": 0, "tagged_lines": 0}
+
+    def flush(batch):
+        for (file_id, line_index, sentence, expected_label), tag_lines in zip(
+                batch, tag_batch(tagger, [item[2] for item in batch])):
+            gold_seen = False
+            for position, word, tag in find_target_tags(tag_lines, target_set):
+                gold = None
+                if word == gold_target and not gold_seen:
+                    gold, gold_seen = expected_label, True
+                occurrences.append({"file": file_id, "line": line_index, "target": word,
+                                    "position": position, "tag": tag, "gold": gold, "sentence": sentence})
+
+    for config in configs:
+        if not os.path.exists(config["filepath"]):
+            print(f"File {config['filepath']} not found.")
+            continue
+        batch = []
+        with CorpusReader(config["filepath"]) as reader:
+            for line_index, sentence in enumerate(reader.iter_sentences()):
+                stats["lines"] += 1
+                if not contains_target(matcher, sentence):
+                    continue
+                stats["tagged_lines"] += 1
+                batch.append((config["id"], line_index, sentence, config.get("expected_label")))
+                if len(batch) == BATCH_SIZE:
+                    flush(batch)
+                    batch = []
+        if batch:
+            flush(batch)
+
+    report = {"lines": stats["lines"], "tagged_lines": stats["tagged_lines"],
+              "skipped_lines": stats["lines"] - stats["tagged_lines"], "targets": {}}
+    for target in targets:
+        target_occurrences = [occurrence for occurrence in occurrences if occurrence["target"] == target]
+        graded = [occurrence for occurrence in target_occurrences if occurrence["gold"] is not None]
+        report["targets"][target] = {
+            "occurrences": len(target_occurrences),
+            "sentences": len({(o["file"], o["line"]) for o in target_occurrences}),
+            "tags": dict(Counter(o["tag"] for o in target_occurrences).most_common()),
+            "graded": len(graded),
+            "accuracy": (sum(o["tag"] == o["gold"] for o in graded) / len(graded)) * 100 if graded else None,
+        }
+    return occurrences, report
+
+
+def save_occurrences(occurrences, path=occurrences_path):
+    columns = ["file", "line", "target", "position", "tag", "gold", "sentence"]
+    with open(path, "w", encoding="utf-8") as output_file:
+        output_file.write("\t".join(columns) + "\n")
+        for occurrence in occurrences:
+            output_file.write("\t".join("" if occurrence[c] is None else str(occurrence[c]) for c in columns) + "\n")
+
+
+if __name__ == "__main__":
+    # Usage: python multi_target_evaluation.py [model_name] [target ...]
+    model_name = sys.argv[1] if len(sys.argv) > 1 else "our_model"
+    targets = sys.argv[2:] or default_targets
+    tagger = treetaggerwrapper.TreeTagger(TAGPARFILE=os.path.join(training_folder, f"{model_name}.par"))
+
+    occurrences, report = evaluate_targets(tagger, targets)
+    report["model"] = model_name
+    print(f"Tagged {report['tagged_lines']} of {report['lines']} lines")
+    for target, stats in report["targets"].items():
+        accuracy = f", accuracy {stats['accuracy']:.2f}%" if stats["accuracy"] is not None else ""
+        print(f"{target}: {stats['occurrences']} occurrences in {stats['sentences']} sentences{accuracy}")
+
+    os.makedirs(output_folder, exist_ok=True)
+    save_occurrences(occurrences)
+    with open(report_path, "w", encoding="utf-8") as json_file:
+        json.dump(report, json_file, indent=4)
+    print(f"Multi-target Report saved in {report_path}")
@@ -0,0 +1,22 @@
+import nltk
+
+# Where each NLTK package lives inside nltk_data (used to check the local cache without the network)
+RESOURCE_PATHS = {
+    "punkt": "tokenizers/punkt",
+    "averaged_perceptron_tagger_eng": "taggers/averaged_perceptron_tagger_eng",
+    "wordnet": "corpora/wordnet",
+    "omw-1.4": "corpora/omw-1.4",
+    "stopwords": "corpora/stopwords",
+}
+
+
+def ensure_nltk_resources(*names):
+    """
+    Make sure the given NLTK packages are available. Each one is looked up in the local
+    nltk_data cache first (no network access); only missing packages are downloaded.
+    """
+    for name in names:
+        try:
+            nltk.data.find(RESOURCE_PATHS.get(name, name))
+        except LookupError:
+            nltk.download(name, quiet=True)
@@ -1,8 +1,10 @@
+import corpus_io
+
 def extract_unique_tags(lexicon_file, output_file):
     unique_tags = set()  # Using a set to ensure tags are unique
 
     # Open the lexicon file and read it
-    with open(lexicon_file, 'r') as infile:
+    with corpus_io.open_text(corpus_io.resolve_path(lexicon_file)) as infile:
         for line in infile:
             parts = line.strip().split()  # Split the line into parts
             if len(parts) == 3:  # Ensure the line has exactly three parts: word, tag, and word again
@@ -17,8 +19,12 @@ def extract_unique_tags(lexicon_file, output_file):
 
     print(f"Unique tags have been written to: {output_file}")
 
-# Example usage
-lexicon_file = 'dataset/lexicon.txt'  # Path to your lexicon file
-output_file = 'dataset/OpenCLs.txt'   # Path to the output OpenCLs file
+def main():
+    # Example usage
+    lexicon_file = 'dataset/lexicon.txt'  # Path to your lexicon file
+    output_file = 'dataset/OpenCLs.txt'   # Path to the output OpenCLs file
+
+    extract_unique_tags(lexicon_file, output_file)
 
-extract_unique_tags(lexicon_file, output_file)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+import os
+import json
+import time
+import queue
+import argparse
+import threading
+import http.client
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from that_tagging import SENTENCE_SEPARATOR, tag_batch, find_that_tag, parse_tag_lines
+
+# Define folder paths
+training_folder = "Training"
+
+# Latency histogram bucket upper bounds, in milliseconds (the last bucket is open-ended)
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (thread-safe).
+    """
+
+    def __init__(self, buckets):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.n = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self.lock:
+            self.counts[index] += 1
+            self.total += value
+            self.n += 1
+
+    def snapshot(self):
+        with self.lock:
+            labels = [f"<={bound}" for bound in self.buckets] + [f">{self.buckets[-1]}"]
+            return {
+                "buckets": dict(zip(labels, self.counts)),
+                "count": self.n,
+                "mean": self.total / self.n if self.n else 0.0,
+            }
+
+
+def load_tagger(model_path):
+    """
+    Start a TreeTagger process for a model (treetaggerwrapper is imported here so tests can pass a stub tagger).
+    """
+    import treetaggerwrapper
+    return treetaggerwrapper.TreeTagger(TAGPARFILE=model_path)
+
+
+class ModelWorker:
+    """
+    Keeps one TreeTagger process hot for a model and coalesces queued sentences into micro-batches:
+    the worker thread waits for a first sentence, then collects more for up to max_wait_ms
+    (or until max_batch sentences) and tags them all with a single TreeTagger call.
+    """
+
+    def __init__(self, model_name, model_path, max_batch=32, max_wait_ms=5.0, tagger=None):
+        self.model_name = model_name
+        self.tagger = tagger if tagger is not None else load_tagger(model_path)
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = queue.Queue()
+        self.batch_sizes = Histogram([1, 2, 4, 8, 16, 32, 64, 128])
+        self.queue_wait = Histogram(LATENCY_BUCKETS_MS)
+        self.thread = threading.Thread(target=self.run, name=f"tagger-{model_name}", daemon=True)
+        self.thread.start()
+
+    def submit(self, sentence):
+        future = Future()
+        self.queue.put((sentence, future, time.perf_counter()))
+        return future
+
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            started = time.perf_counter()
+            for _, _, enqueued in batch:
+                self.queue_wait.observe((started - enqueued) * 1000)
+            self.batch_sizes.observe(len(batch))
+            try:
+                results = tag_batch(self.tagger, [sentence for sentence, _, _ in batch])
+            except Exception as error:  # hand the failure to every waiting request
+                for _, future, _ in batch:
+                    future.set_exception(error)
+                continue
+            for (_, future, _), tag_lines in zip(batch, results):
+                future.set_result(tag_lines)
+
+    def metrics(self):
+        return {
+            "queue_depth": self.queue.qsize(),
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_ms": self.queue_wait.snapshot(),
+        }
+
+
+class TaggingService:
+    """
+    The set of hot models plus request-level latency metrics.
+    """
+
+    def __init__(self, model_names, max_batch=32, max_wait_ms=5.0, folder=training_folder, taggers=None):
+        taggers = taggers or {}
+        self.workers = {
+            name: ModelWorker(name, os.path.join(folder, f"{name}.par"), max_batch, max_wait_ms, taggers.get(name))
+            for name in model_names
+        }
+        self.default_model = model_names[0]
+        self.latency = Histogram(LATENCY_BUCKETS_MS)
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def tag(self, sentences, model_name=None):
+        """
+        Tag sentences with a model. Returns, per sentence, the "that" tag (as get_that_tag does)
+        and the full token/tag/lemma stream.
+        Sentences containing the batch separator are rejected (ValueError): they would split into
+        several results and shift the answers of the other requests batched with them.
+        """
+        for sentence in sentences:
+            if not isinstance(sentence, str):
+                raise ValueError(f"Sentences must be strings, got {type(sentence).__name__}")
+            if SENTENCE_SEPARATOR in sentence:
+                raise ValueError(f"Sentences may not contain {SENTENCE_SEPARATOR}")
+        start = time.perf_counter()
+        worker = self.workers[model_name or self.default_model]
+        futures = [worker.submit(sentence) for sentence in sentences]
+        results = []
+        for future in futures:
+            tag_lines = future.result()
+            results.append({
+                "that_tag": find_that_tag(tag_lines),
+                "tokens": [{"word": word, "tag": tag, "lemma": lemma}
+                           for word, tag, lemma in parse_tag_lines(tag_lines)],
+            })
+        self.latency.observe((time.perf_counter() - start) * 1000)
+        with self.lock:
+            self.requests += 1
+        return results
+
+    def metrics(self):
+        return {
+            "requests": self.requests,
+            "latency_ms": self.latency.snapshot(),
+            "models": {name: worker.metrics() for name, worker in self.workers.items()},
+        }
+
+
+def parse_request(body):
+    """
+    Validate a /tag request body: a JSON object with a list of strings under "sentences"
+    (or a single string under "sentence") and an optional model name.
+    Returns (sentences, model name or None); raises ValueError for any other body.
+    """
+    request = json.loads(body)
+    if not isinstance(request, dict):
+        raise ValueError("the body must be a JSON object")
+    if "sentences" in request:
+        sentences = request["sentences"]
+        if not isinstance(sentences, list) or not all(isinstance(sentence, str) for sentence in sentences):
+            raise ValueError('"sentences" must be a list of strings')
+    elif isinstance(request.get("sentence"), str):
+        sentences = [request["sentence"]]
+    else:
+        raise ValueError('"sentences" (a list of strings) or "sentence" (a string) is required')
+    model_name = request.get("model")
+    if model_name is not None and not isinstance(model_name, str):
+        raise ValueError('"model" must be a string')
+    return sentences, model_name
+
+
+def make_handler(service):
+    """
+    Build the HTTP request handler bound to a TaggingService.
+    POST /tag  {"sentences": [...], "model": "our_model"}  (or {"sentence": "..."})
+    GET  /metrics, GET /models
+    """
+
+    class TaggingHandler(BaseHTTPRequestHandler):
+
+        def send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/metrics":
+                self.send_json(200, service.metrics())
+            elif self.path == "/models":
+                self.send_json(200, {"models": list(service.workers), "default": service.default_model})
+            else:
+                self.send_json(404, {"error": f"Unknown path {self.path}"})
+
+        def do_POST(self):
+            if self.path != "/tag":
+                self.send_json(404, {"error": f"Unknown path {self.path}"})
+                return
+            try:
+                sentences, model_name = parse_request(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            except ValueError as error:
+                self.send_json(400, {"error": f"Invalid request: {error}"})
+                return
+            if model_name is not None and model_name not in service.workers:
+                self.send_json(400, {"error": f"Model {model_name} is not loaded"})
+                return
+            try:
+                results = service.tag(sentences, model_name)
+            except ValueError as error:
+                self.send_json(400, {"error": f"Invalid request: {error}"})
+                return
+            except Exception as error:  # a tagging failure must not drop the connection
+                self.send_json(500, {"error": f"Tagging failed: {error!r}"})
+                return
+            self.send_json(200, {"results": results})
+
+        def log_message(self, format, *args):
+            pass  # keep the console quiet; latency is tracked in /metrics
+
+    return TaggingHandler
+
+
+class TaggingHTTPServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server with a listen backlog large enough for bursts of concurrent clients.
+    """
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def start_server(model_names, host="127.0.0.1", port=8765, max_batch=32, max_wait_ms=5.0, taggers=None):
+    """
+    Start the tagging service in a background thread and return the HTTP server
+    (call server.shutdown() to stop it). Use port=0 to pick a free port.
+    taggers optionally maps model names to ready tagger objects (e.g. stubs in tests).
+    """
+    service = TaggingService(model_names, max_batch=max_batch, max_wait_ms=max_wait_ms, taggers=taggers)
+    server = TaggingHTTPServer((host, port), make_handler(service))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class TaggingClient:
+    """
+    Minimal loopback client for the tagging service.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765):
+        self.host = host
+        self.port = port
+
+    def request(self, method, path, payload=None):
+        connection = http.client.HTTPConnection(self.host, self.port)
+        try:
+            body = json.dumps(payload) if payload is not None else None
+            connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            return response.status, json.loads(response.read())
+        finally:
+            connection.close()
+
+    def tag(self, sentences, model=None):
+        payload = {"sentences": list(sentences)}
+        if model is not None:
+            payload["model"] = model
+        status, response = self.request("POST", "/tag", payload)
+        if status != 200:
+            raise RuntimeError(response.get("error", f"HTTP {status}"))
+        return response["results"]
+
+    def metrics(self):
+        return self.request("GET", "/metrics")[1]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serve "that" disambiguation with hot TreeTagger models.')
+    parser.add_argument("--models", nargs="+", default=["our_model"], help="model names in Training/ (without .par)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=32, help="maximum sentences per TreeTagger call")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="time to wait for a batch to fill")
+    args = parser.parse_args()
+
+    server = start_server(args.models, args.host, args.port, args.max_batch, args.max_wait_ms)
+    print(f"Serving {', '.join(args.models)} on http://{args.host}:{server.server_address[1]}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
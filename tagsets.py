@@ -0,0 +1,143 @@
+import numpy as np
+
+# Penn Treebank (NLTK) -> custom CLAWS8-like tags, used by Tagging.map_tag
+PENN_TO_CLAWS8 = {
+    "CC": "CC",        # Coordinating conjunction
+    "CD": "CD",        # Cardinal number
+    "DT": "AT0",       # Determiner/article (CLAWS8 uses AT0 for articles)
+    "EX": "EX",        # Existential there
+    "FW": "FW",        # Foreign word
+    "IN": "II",        # Preposition or subordinating conjunction
+    "JJ": "AJ0",       # Adjective, positive degree
+    "JJR": "AJC",      # Adjective, comparative
+    "JJS": "AJS",      # Adjective, superlative
+    "LS": "LS",        # List marker
+    "MD": "MD",        # Modal
+    "NN": "NN1",       # Singular common noun
+    "NNS": "NN2",      # Plural common noun
+    "NNP": "NP",       # Singular proper noun
+    "NNPS": "NPS",     # Plural proper noun
+    "PDT": "DD0",      # Pre-determiner
+    "POS": "POS",      # Possessive ending
+    "PRP": "PP",       # Personal pronoun
+    "PRP$": "PP$",     # Possessive pronoun
+    "RB": "RG0",       # Adverb, base form
+    "RBR": "RGC",      # Adverb, comparative
+    "RBS": "RGS",      # Adverb, superlative
+    "RP": "RP",        # Particle
+    "SYM": "SYM",      # Symbol
+    "TO": "TO",        # To
+    "UH": "UH",        # Interjection
+    "VB": "VVB",       # Verb, base form
+    "VBD": "VVD",      # Verb, past tense
+    "VBG": "VVG",      # Verb, present participle/gerund
+    "VBN": "VVN",      # Verb, past participle
+    "VBP": "VVP",      # Verb, non-3rd person singular present
+    "VBZ": "VVZ",      # Verb, 3rd person singular present
+    "WDT": "WDT",      # Wh-determiner
+    "WP": "WP",        # Wh-pronoun
+    "WP$": "WPS",      # Possessive wh-pronoun
+    "WRB": "WRB"       # Wh-adverb
+}
+
+# Gold categories of "that" (the single gold standard every tagset is scored against)
+CATEGORIES = ["noun_conjunction", "adverb", "verb_conjunction", "determiner", "pronoun"]
+
+# Expected "that" tag of each category, per tagset
+EXPECTED_LABELS = {
+    "custom": {"noun_conjunction": "CST", "adverb": "RA", "verb_conjunction": "CJT", "determiner": "DD1", "pronoun": "WPR"},
+    "bnc": {"noun_conjunction": "CJT", "adverb": "AV0", "verb_conjunction": "CJT", "determiner": "DT0", "pronoun": "CJT"},
+    "penn": {"noun_conjunction": "IN", "adverb": "RB", "verb_conjunction": "IN", "determiner": "DT", "pronoun": "WDT"},
+}
+
+# Gold category of each Data/Test file
+TEST_FILE_CATEGORIES = {
+    "NNC_test_text": "noun_conjunction",
+    "that_adv": "adverb",
+    "that_conjunction": "verb_conjunction",
+    "that_determiner": "determiner",
+    "that_pronoun": "pronoun",
+}
+
+
+def expected_label(tagset, file_id):
+    """
+    Expected "that" tag of a Data/Test file in the given tagset.
+    """
+    return EXPECTED_LABELS[tagset][TEST_FILE_CATEGORIES[file_id]]
+
+
+def possible_labels(tagset):
+    """
+    Distinct expected labels of a tagset, in category order (rows/columns of confusion matrix 2).
+    """
+    labels = []
+    for category in CATEGORIES:
+        label = EXPECTED_LABELS[tagset][category]
+        if label not in labels:
+            labels.append(label)
+    return labels
+
+
+class TagVocabulary:
+    """
+    Interns tag strings into integer ids shared by every tagset. Id 0 stands for "no prediction" (None).
+    """
+
+    def __init__(self, tags=()):
+        self.tags = [None]
+        self.ids = {None: 0}
+        for tag in tags:
+            self.add(tag)
+
+    def add(self, tag):
+        if tag not in self.ids:
+            self.ids[tag] = len(self.tags)
+            self.tags.append(tag)
+        return self.ids[tag]
+
+    def encode(self, labels):
+        return np.fromiter((self.add(label) for label in labels), dtype=np.int32)
+
+
+# Shared vocabulary, pre-filled with every tag of the three tagsets
+vocabulary = TagVocabulary(
+    list(PENN_TO_CLAWS8) + list(PENN_TO_CLAWS8.values())
+    + [label for labels in EXPECTED_LABELS.values() for label in labels.values()]
+)
+
+# Precompiled lookup tables: EXPECTED_IDS[tagset][category id] -> expected tag id
+EXPECTED_IDS = {
+    tagset: np.array([vocabulary.ids[labels[category]] for category in CATEGORIES], dtype=np.int32)
+    for tagset, labels in EXPECTED_LABELS.items()
+}
+
+
+def encode_categories(categories):
+    """
+    Encode gold category names (or Data/Test file ids) as category ids.
+    """
+    index = {category: i for i, category in enumerate(CATEGORIES)}
+    return np.array([index[TEST_FILE_CATEGORIES.get(category, category)] for category in categories], dtype=np.int32)
+
+
+def score(gold_categories, predictions):
+    """
+    Score several tagsets against one gold standard in a single pass.
+    gold_categories: array of category ids; predictions: {tagset: array of predicted tag ids}.
+    Returns {tagset: {"accuracy": %, "categories": {category: %}}}.
+    """
+    gold_categories = np.asarray(gold_categories)
+    totals = np.bincount(gold_categories, minlength=len(CATEGORIES))
+    results = {}
+    for tagset, predicted in predictions.items():
+        correct = np.asarray(predicted) == EXPECTED_IDS[tagset][gold_categories]
+        correct_per_category = np.bincount(gold_categories, weights=correct, minlength=len(CATEGORIES))
+        results[tagset] = {
+            "accuracy": float(correct.mean() * 100) if len(correct) else 0.0,
+            "categories": {
+                category: float(correct_per_category[i] / totals[i] * 100) if totals[i] else 0.0
+                for i, category in enumerate(CATEGORIES)
+            },
+        }
+    return results
@@ -0,0 +1,73 @@
+import os
+import json
+
+import pytest
+
+from distributed_evaluation import connect, init_queue, result_path, run_worker
+
+
+class StubTagger:
+    """
+    Stands in for treetaggerwrapper.TreeTagger: tags "that" as CST and every other token as NN.
+    """
+
+    def tag_text(self, text):
+        return [f"{word}\t{'CST' if word.lower() == 'that' else 'NN'}\t{word.lower()}" for word in text.split()]
+
+
+def write_sentences(path, start, stop):
+    with open(path, "a", encoding="utf-8") as corpus_file:
+        for i in range(start, stop):
+            corpus_file.write(f"sentence {i} says that it works\n")
+
+
+def queued_sentences(queue_dir):
+    """
+    Sentences covered by the result files of every done unit.
+    """
+    connection = connect(queue_dir)
+    unit_ids = [row[0] for row in connection.execute("SELECT id FROM units WHERE status = 'done'")]
+    connection.close()
+    sentences = []
+    for unit_id in unit_ids:
+        with open(result_path(queue_dir, unit_id), "r", encoding="utf-8") as json_file:
+            sentences.extend(result[0] for result in json.load(json_file)["results"])
+    return sentences
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    path = tmp_path / "that_conjunction.txt"
+    write_sentences(path, 0, 60)
+    configs = [{"id": "that_conjunction", "expected_label": "CST", "filepath": str(path)}]
+    return path, configs, str(tmp_path / "queue")
+
+
+def test_reinit_with_same_corpus_keeps_units(corpus):
+    path, configs, queue_dir = corpus
+    init_queue(queue_dir, configs=configs)
+    assert run_worker(queue_dir, "test", tagger=StubTagger()) == 2
+    init_queue(queue_dir, configs=configs)
+    assert run_worker(queue_dir, "test", tagger=StubTagger()) == 0
+    assert len(queued_sentences(queue_dir)) == 60
+
+
+def test_grown_corpus_is_refused_then_reset(corpus):
+    path, configs, queue_dir = corpus
+    init_queue(queue_dir, configs=configs)
+    run_worker(queue_dir, "test", tagger=StubTagger())
+
+    write_sentences(path, 60, 90)
+    with pytest.raises(ValueError):
+        init_queue(queue_dir, configs=configs)
+
+    init_queue(queue_dir, configs=configs, reset=True)
+    connection = connect(queue_dir)
+    units = connection.execute("SELECT start, stop, status FROM units ORDER BY start").fetchall()
+    connection.close()
+    assert units == [(0, 50, "pending"), (50, 90, "pending")]
+    assert os.listdir(os.path.join(queue_dir, "results")) == []
+
+    run_worker(queue_dir, "test", tagger=StubTagger())
+    sentences = queued_sentences(queue_dir)
+    assert len(sentences) == len(set(sentences)) == 90
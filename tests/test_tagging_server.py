@@ -0,0 +1,122 @@
+import threading
+
+import pytest
+
+from that_tagging import SENTENCE_SEPARATOR
+from tagging_server import TaggingClient, start_server
+
+
+class StubTagger:
+    """
+    Stands in for treetaggerwrapper.TreeTagger: tags "that" as CST and every other token as NN,
+    and records the number of tag_text calls.
+    """
+
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def tag_text(self, text):
+        with self.lock:
+            self.calls += 1
+        if self.fail:
+            raise RuntimeError("tagger crashed")
+        lines = []
+        for line in text.split("\n"):
+            if line.strip() == SENTENCE_SEPARATOR:
+                lines.append(SENTENCE_SEPARATOR)
+                continue
+            for word in line.split():
+                lines.append(f"{word}\t{'CST' if word.lower() == 'that' else 'NN'}\t{word.lower()}")
+        return lines
+
+
+@pytest.fixture
+def server():
+    stub = StubTagger()
+    server = start_server(["stub_model"], port=0, max_batch=64, max_wait_ms=200.0, taggers={"stub_model": stub})
+    yield server, stub, TaggingClient(port=server.server_address[1])
+    server.shutdown()
+
+
+def test_concurrent_requests_are_coalesced(server):
+    _, stub, client = server
+    n_clients = 8
+    results = [None] * n_clients
+
+    def send(i):
+        results[i] = client.tag([f"claim {i} that w{i}", f"no target {i}"])
+
+    threads = [threading.Thread(target=send, args=(i,)) for i in range(n_clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for i, result in enumerate(results):
+        assert result[0]["that_tag"] == "CST"
+        assert [token["word"] for token in result[0]["tokens"]] == ["claim", str(i), "that", f"w{i}"]
+        assert result[1]["that_tag"] is None
+    assert stub.calls < n_clients
+
+    metrics = client.metrics()
+    assert metrics["requests"] == n_clients
+    assert metrics["latency_ms"]["count"] == n_clients
+    model_metrics = metrics["models"]["stub_model"]
+    assert model_metrics["batch_size"]["count"] == stub.calls
+    assert model_metrics["queue_wait_ms"]["count"] == 2 * n_clients
+    assert model_metrics["queue_depth"] == 0
+
+
+def test_separator_in_sentence_is_rejected(server):
+    _, stub, client = server
+    status, response = client.request("POST", "/tag", {"sentences": [f"a {SENTENCE_SEPARATOR} that b"]})
+    assert status == 400
+    assert stub.calls == 0
+    assert client.tag(["so that is it"])[0]["that_tag"] == "CST"
+
+
+def test_tagger_failure_returns_500():
+    server = start_server(["broken"], port=0, max_wait_ms=1.0, taggers={"broken": StubTagger(fail=True)})
+    try:
+        status, response = TaggingClient(port=server.server_address[1]).request("POST", "/tag", {"sentence": "that"})
+        assert status == 500
+        assert "tagger crashed" in response["error"]
+    finally:
+        server.shutdown()
+
+
+def test_result_count_mismatch_fails_the_batch():
+    class MergingTagger(StubTagger):
+        # Drops the separators, so a batch of several sentences comes back as a single result
+        def tag_text(self, text):
+            return [line for line in super().tag_text(text) if line != SENTENCE_SEPARATOR]
+
+    server = start_server(["merging"], port=0, max_wait_ms=50.0, taggers={"merging": MergingTagger()})
+    try:
+        status, response = TaggingClient(port=server.server_address[1]).request(
+            "POST", "/tag", {"sentences": ["that one", "that two"]}
+        )
+        assert status == 500
+        assert "2 sentences" in response["error"]
+    finally:
+        server.shutdown()
+
+
+@pytest.mark.parametrize("payload", [
+    {"sentences": "that x"},
+    {"sentences": None},
+    {"sentences": ["that x", 3]},
+    {"sentence": None},
+    {"model": "stub_model"},
+    {"sentence": "that x", "model": 1},
+    ["that x"],
+    "that x",
+])
+def test_malformed_requests_return_400(server, payload):
+    _, stub, client = server
+    status, response = client.request("POST", "/tag", payload)
+    assert status == 400
+    assert response["error"].startswith("Invalid request")
+    assert stub.calls == 0
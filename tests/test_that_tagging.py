@@ -0,0 +1,41 @@
+import pytest
+
+from that_tagging import SENTENCE_SEPARATOR, tag_batch, tag_token_batch, tokenize_batch
+
+
+class EchoTagger:
+    """
+    Stands in for treetaggerwrapper.TreeTagger: one output line per input token, separators passed through.
+    drop_separators simulates a tagger that loses the sentence boundaries.
+    """
+
+    def __init__(self, drop_separators=False):
+        self.drop_separators = drop_separators
+
+    def tag_text(self, text, prepronly=False, tagonly=False):
+        tokens = text if isinstance(text, list) else text.split()
+        lines = []
+        for token in tokens:
+            if token == SENTENCE_SEPARATOR:
+                if not self.drop_separators:
+                    lines.append(token)
+            else:
+                lines.append(token if prepronly else f"{token}\tNN\t{token}")
+        return lines
+
+
+def test_batches_split_back_per_sentence():
+    tagger = EchoTagger()
+    assert tokenize_batch(tagger, ["a that", "b"]) == [["a", "that"], ["b"]]
+    assert [len(lines) for lines in tag_batch(tagger, ["a that", "b"])] == [2, 1]
+    assert [len(lines) for lines in tag_token_batch(tagger, [["a", "that"], ["b"]])] == [2, 1]
+
+
+@pytest.mark.parametrize("call", [
+    lambda tagger: tag_batch(tagger, ["a that", "b"]),
+    lambda tagger: tokenize_batch(tagger, ["a that", "b"]),
+    lambda tagger: tag_token_batch(tagger, [["a", "that"], ["b"]]),
+])
+def test_lost_separator_raises(call):
+    with pytest.raises(RuntimeError, match="1 results for 2 sentences"):
+        call(EchoTagger(drop_separators=True))
@@ -0,0 +1,267 @@
+import os
+
+import tagsets
+import corpus_io
+
+# Define folder paths
+data_folder = "Data/Test"
+output_folder = "Results"
+
+# Test file configurations for the custom models (same as our_model_evaluation.py).
+file_configs = [
+    {
+        "id": "NNC_test_text",
+        "expected_label": tagsets.expected_label("custom", "NNC_test_text"),
+        "filename": "NNC_test_text.txt",
+        "filepath": corpus_io.resolve_path(os.path.join(data_folder, "NNC_test_text.txt"))
+    },
+    {
+        "id": "that_adv",
+        "expected_label": tagsets.expected_label("custom", "that_adv"),
+        "filename": "that_adv.txt",
+        "filepath": corpus_io.resolve_path(os.path.join(data_folder, "that_adv.txt"))
+    },
+    {
+        "id": "that_conjunction",
+        "expected_label": tagsets.expected_label("custom", "that_conjunction"),
+        "filename": "that_conjunction.txt",
+        "filepath": corpus_io.resolve_path(os.path.join(data_folder, "that_conjunction.txt"))
+    },
+    {
+        "id": "that_determiner",
+        "expected_label": tagsets.expected_label("custom", "that_determiner"),
+        "filename": "that_determiner.txt",
+        "filepath": corpus_io.resolve_path(os.path.join(data_folder, "that_determiner.txt"))
+    },
+    {
+        "id": "that_pronoun",
+        "expected_label": tagsets.expected_label("custom", "that_pronoun"),
+        "filename": "that_pronoun.txt",
+        "filepath": corpus_io.resolve_path(os.path.join(data_folder, "that_pronoun.txt"))
+    }
+]
+
+
+def find_that_tag(tag_lines):
+    """
+    Return the POS tag of the first "that" in TreeTagger output lines (word<TAB>tag<TAB>lemma).
+    """
+    for tag in tag_lines:
+        parts = tag.split("\t")
+        if len(parts) >= 2 and parts[0].lower() == "that":
+            return parts[1]  # Return the POS tag
+    return None  # "that" not found
+
+
+def get_that_tag(tagger, sentence):
+    """
+    Process a sentence with the given TreeTagger and return the POS tag for the token "that".
+    """
+    return find_that_tag(tagger.tag_text(sentence))
+
+
+def read_test_sentences(file_path):
+    """
+    Read the non-blank lines (one sentence per line) of a test file.
+    """
+    with corpus_io.open_text(file_path) as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+# SGML marker inserted between sentences when several sentences are tagged in one call.
+# TreeTagger passes SGML tags through untouched, so the marker splits the output back per sentence.
+SENTENCE_SEPARATOR = "<sentence_break/>"
+
+
+def tag_batch(tagger, sentences):
+    """
+    Tag several sentences with a single TreeTagger call.
+    Returns one list of TreeTagger output lines per sentence
+    (RuntimeError if the output does not split into exactly one list per sentence).
+    """
+    return split_on_separator(tagger.tag_text(f"\n{SENTENCE_SEPARATOR}\n".join(sentences)), len(sentences))
+
+
+def parse_tag_lines(tag_lines):
+    """
+    Turn TreeTagger output lines into (word, tag, lemma) triples.
+    """
+    triples = []
+    for line in tag_lines:
+        parts = line.split("\t")
+        if len(parts) >= 2:
+            triples.append((parts[0], parts[1], parts[2] if len(parts) > 2 else parts[0]))
+    return triples
+
+
+def evaluate_predictor(predict, configs=file_configs):
+    """
+    Run predict(sentence) -> tag over every test file.
+    Returns (overall_true, overall_pred, accuracies, file_results_dict, conf_matrix) as in the evaluation scripts.
+    """
+    overall_true = []
+    overall_pred = []
+    accuracies = {}
+    file_results_dict = {}
+    conf_matrix = {}
+
+    for config in configs:
+        file_id = config["id"]
+        expected_label = config["expected_label"]
+        if not os.path.exists(config["filepath"]):
+            print(f"File {config['filepath']} not found.")
+            continue
+
+        file_results = []
+        correct_predictions = 0
+        conf_matrix[file_id] = {}
+        for sentence in read_test_sentences(config["filepath"]):
+            predicted_tag = predict(sentence)
+            overall_true.append(expected_label)
+            overall_pred.append(predicted_tag)
+            file_results.append((sentence, expected_label, predicted_tag))
+            if predicted_tag == expected_label:
+                correct_predictions += 1
+            conf_matrix[file_id][predicted_tag] = conf_matrix[file_id].get(predicted_tag, 0) + 1
+
+        total_sentences = len(file_results)
+        accuracy = (correct_predictions / total_sentences) * 100 if total_sentences > 0 else 0
+        accuracies[file_id] = {"accuracy": accuracy, "num_sentences": total_sentences}
+        file_results_dict[file_id] = file_results
+
+    return overall_true, overall_pred, accuracies, file_results_dict, conf_matrix
+
+
+def save_reports(model_name, overall_true, overall_pred, accuracies, file_results_dict, conf_matrix,
+                 all_possible_tags=("CST", "RA", "CJT", "DD1", "WPR"), folder=output_folder,
+                 compression=corpus_io.default_compression):
+    """
+    Save the per-file results, both confusion matrices, the classification report and the accuracy report
+    under Results/ with a model name prefix, in the same formats as our_model_evaluation.py.
+    The per-file results dumps are compressed with the given compression (see corpus_io).
+    """
+    import json
+    import pandas as pd
+    from sklearn.metrics import classification_report
+
+    os.makedirs(folder, exist_ok=True)
+    for file_id, file_results in file_results_dict.items():
+        output_file_path = corpus_io.output_path(
+            os.path.join(folder, f"{model_name}_results_{file_id}.txt"), compression
+        )
+        with corpus_io.open_text(output_file_path, "w") as output_file:
+            output_file.write("Sentence | True Label | Predicted Tag\n")
+            output_file.write("-" * 60 + "\n")
+            for sentence, true_lab, pred in file_results:
+                output_file.write(f"{sentence} | {true_lab} | {pred}\n")
+
+    # Confusion matrix with file IDs as rows and predicted tags as columns
+    all_pred_tags = sorted({tag for row in conf_matrix.values() for tag in row}, key=str)
+    conf_matrix_complete = {
+        file_id: {tag: conf_matrix[file_id].get(tag, 0) for tag in all_pred_tags} for file_id in conf_matrix
+    }
+    pd.DataFrame(conf_matrix_complete).T.to_csv(os.path.join(folder, f"{model_name}_confusion_matrix.csv"))
+
+    # Confusion matrix of overall true vs. predicted labels
+    all_possible_tags = list(all_possible_tags)
+    cm2 = pd.crosstab(
+        pd.Series(overall_true, name='True'),
+        pd.Series(overall_pred, name='Predicted'),
+        dropna=False
+    )
+    cm2 = cm2.reindex(index=all_possible_tags, columns=all_possible_tags, fill_value=0)
+    cm2.to_csv(os.path.join(folder, f"{model_name}_confusion_matrix_2.csv"))
+
+    class_report = classification_report(overall_true, overall_pred, output_dict=True)
+    with open(os.path.join(folder, f"{model_name}_classification_report.json"), "w", encoding="utf-8") as json_file:
+        json.dump(class_report, json_file, indent=4)
+    with open(os.path.join(folder, f"{model_name}_accuracy_report.json"), "w", encoding="utf-8") as json_file:
+        json.dump(accuracies, json_file, indent=4)
+    print(f"Reports for {model_name} saved in {folder}")
+
+
+def tag_shard(args):
+    """
+    Worker-process entry point: tag sentences start..stop-1 of a file and return their "that" tags.
+    """
+    tagger_kwargs, file_path, start, stop = args
+    import treetaggerwrapper
+    from corpus_reader import CorpusReader
+
+    tagger = treetaggerwrapper.TreeTagger(**tagger_kwargs)
+    with CorpusReader(file_path) as reader:
+        return [get_that_tag(tagger, sentence) for sentence in reader.iter_sentences(start, stop)]
+
+
+def tag_file_parallel(tagger_kwargs, file_path, n_workers=None):
+    """
+    Tag the "that" of every sentence of a single (large) file with a pool of worker processes,
+    each owning a TreeTagger and a contiguous shard of the file's sentence-offset index.
+    Returns (sentences, predicted tags) in file order.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from corpus_reader import CorpusReader
+
+    n_workers = n_workers or os.cpu_count() or 1
+    with CorpusReader(file_path) as reader:
+        sentences = list(reader.iter_sentences())
+        shards = reader.shard_ranges(n_workers)
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        shard_tags = executor.map(tag_shard, [(tagger_kwargs, file_path, start, stop) for start, stop in shards])
+        predictions = [tag for tags in shard_tags for tag in tags]
+    return sentences, predictions
+
+
+def find_target_tags(tag_lines, targets):
+    """
+    Return every occurrence of the target words in TreeTagger output lines
+    as (token position, lowercased word, tag) triples.
+    """
+    occurrences = []
+    position = 0
+    for line in tag_lines:
+        parts = line.split("\t")
+        if len(parts) < 2:
+            continue  # SGML tags are not tokens
+        word = parts[0].lower()
+        if word in targets:
+            occurrences.append((position, word, parts[1]))
+        position += 1
+    return occurrences
+
+
+def split_on_separator(lines, n_sentences):
+    """
+    Split TreeTagger input/output lines on SENTENCE_SEPARATOR into one list per sentence.
+    A missing or extra separator would shift every following result onto the wrong sentence,
+    so anything other than n_sentences lists raises RuntimeError.
+    """
+    results = [[]]
+    for line in lines:
+        if line.strip() == SENTENCE_SEPARATOR:
+            results.append([])
+        else:
+            results[-1].append(line)
+    if len(results) != n_sentences:
+        raise RuntimeError(f"TreeTagger returned {len(results)} results for {n_sentences} sentences")
+    return results
+
+
+def tokenize_batch(tagger, sentences):
+    """
+    Run only TreeTagger's tokenizer (no tagging) over several sentences; returns one token list per sentence.
+    """
+    return split_on_separator(tagger.tag_text(f"\n{SENTENCE_SEPARATOR}\n".join(sentences), prepronly=True),
+                              len(sentences))
+
+
+def tag_token_batch(tagger, token_lists):
+    """
+    Tag several already tokenized sentences with a single TreeTagger call.
+    """
+    lines = []
+    for i, tokens in enumerate(token_lists):
+        if i:
+            lines.append(SENTENCE_SEPARATOR)
+        lines.extend(tokens)
+    return split_on_separator(tagger.tag_text(lines, tagonly=True), len(token_lists))
@@ -0,0 +1,185 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import subprocess
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+
+import corpus_io
+
+# Define folder paths
+training_folder = "Training"
+output_folder = "Results"
+state_filename = "training_state.json"
+report_path = os.path.join(output_folder, "training_report.json")
+
+# The train-tree-tagger binary; override with the TRAIN_TREE_TAGGER environment variable
+# (e.g. to point at a local stand-in script in tests).
+default_binary = os.environ.get("TRAIN_TREE_TAGGER", "train-tree-tagger")
+
+# Default train-tree-tagger options (our training files are UTF-8)
+default_options = ["-utf8"]
+
+# Model specifications: every model shares the lexicon and open class file
+# and is trained from its own formatted file.
+model_specs = [
+    {"name": "adverb_model", "train_file": "adverb_formatted.txt"},
+    {"name": "conjunction_noun_model", "train_file": "conjunction_noun_formatted.txt"},
+    {"name": "conjunction_verb_model", "train_file": "conjunction_verb_formatted.txt"},
+    {"name": "determiner_model", "train_file": "determiner_formatted.txt"},
+    {"name": "pronoun_model", "train_file": "pronoun_formatted.txt"},
+    {"name": "our_model", "train_file": "train.txt"},
+    {"name": "train_model", "train_file": "train.txt"},
+]
+
+
+def file_hash(path):
+    """
+    Compute the SHA-256 digest of a file, reading it in 1 MiB chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as infile:
+        for chunk in iter(lambda: infile.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def spec_paths(spec, folder=training_folder):
+    """
+    Return the input paths (lexicon, open class file, training file) and the output .par path of a spec.
+    Inputs that only exist compressed (e.g. train.txt.gz) resolve to the compressed file.
+    """
+    return {
+        "lexicon": corpus_io.resolve_path(os.path.join(folder, spec.get("lexicon", "lexicon.txt"))),
+        "open_class": corpus_io.resolve_path(os.path.join(folder, spec.get("open_class", "openCLs.txt"))),
+        "train_file": corpus_io.resolve_path(os.path.join(folder, spec["train_file"])),
+        "output": os.path.join(folder, spec.get("output", f"{spec['name']}.par")),
+    }
+
+
+def spec_fingerprint(spec, options, folder=training_folder):
+    """
+    Fingerprint a training job from the hashes of its input artifacts and its options.
+    """
+    paths = spec_paths(spec, folder)
+    inputs = {key: file_hash(paths[key]) for key in ["lexicon", "open_class", "train_file"]}
+    digest = hashlib.sha256(json.dumps({"inputs": inputs, "options": options}, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest(), inputs
+
+
+def load_state(path):
+    """
+    Load the recorded fingerprints of previously trained models.
+    """
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as json_file:
+            return json.load(json_file)
+    return {}
+
+
+def save_state(state, path):
+    """
+    Save the training state atomically so an interrupted run never leaves a truncated file.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as json_file:
+        json.dump(state, json_file, indent=4)
+    os.replace(tmp_path, path)
+
+
+def train_model(spec, options=None, binary=default_binary, folder=training_folder):
+    """
+    Run train-tree-tagger for a single model spec and return its training record
+    (fingerprint, input hashes, options, training time and model size).
+    The model is written to a temporary file first so a failed run keeps the previous .par.
+    Compressed inputs are expanded to temporary plain files for the duration of the run.
+    """
+    options = list(default_options if options is None else options)
+    paths = spec_paths(spec, folder)
+    fingerprint, inputs = spec_fingerprint(spec, options, folder)
+
+    tmp_output = paths["output"] + ".tmp"
+    start = time.perf_counter()
+    with ExitStack() as stack:
+        plain_inputs = [stack.enter_context(corpus_io.plain_copy(paths[key]))
+                        for key in ["lexicon", "open_class", "train_file"]]
+        command = [binary] + plain_inputs + [tmp_output] + options
+        completed = subprocess.run(command, capture_output=True, text=True)
+    training_time = time.perf_counter() - start
+    if completed.returncode != 0:
+        if os.path.exists(tmp_output):
+            os.remove(tmp_output)
+        raise RuntimeError(f"train-tree-tagger failed for {spec['name']}:\n{completed.stderr}")
+    os.replace(tmp_output, paths["output"])
+
+    return {
+        "fingerprint": fingerprint,
+        "inputs": inputs,
+        "options": options,
+        "training_time": training_time,
+        "model_size": os.path.getsize(paths["output"]),
+        "trained_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def stale_specs(specs, state, options, folder=training_folder):
+    """
+    Return the specs whose .par file is missing or whose inputs/options changed since the last training.
+    """
+    stale = []
+    for spec in specs:
+        paths = spec_paths(spec, folder)
+        fingerprint, _ = spec_fingerprint(spec, options, folder)
+        record = state.get(spec["name"])
+        if not os.path.exists(paths["output"]) or record is None or record["fingerprint"] != fingerprint:
+            stale.append(spec)
+    return stale
+
+
+def train_all(specs=model_specs, options=None, binary=default_binary, folder=training_folder,
+              max_workers=None, force=False):
+    """
+    Train every stale model in parallel (one train-tree-tagger process per model)
+    and return the updated training state.
+    """
+    options = list(default_options if options is None else options)
+    state_file = os.path.join(folder, state_filename)
+    state = load_state(state_file)
+    to_train = list(specs) if force else stale_specs(specs, state, options, folder)
+
+    for spec in specs:
+        if spec not in to_train:
+            print(f"{spec['name']} is up to date.")
+
+    failures = {}
+    with ThreadPoolExecutor(max_workers=max_workers or max(1, len(to_train))) as executor:
+        futures = {spec["name"]: executor.submit(train_model, spec, options, binary, folder) for spec in to_train}
+        for name, future in futures.items():
+            try:
+                state[name] = future.result()
+                print(f"Trained {name} in {state[name]['training_time']:.2f}s ({state[name]['model_size']} bytes)")
+            except (RuntimeError, OSError) as error:
+                failures[name] = str(error)
+                print(error)
+
+    save_state(state, state_file)
+    if failures:
+        raise RuntimeError(f"Training failed for: {', '.join(sorted(failures))}")
+    return state
+
+
+if __name__ == "__main__":
+    force = "--force" in sys.argv[1:]
+    state = train_all(force=force)
+
+    # Save a training report (training time and model size per model)
+    os.makedirs(output_folder, exist_ok=True)
+    report = {
+        name: {"training_time": record["training_time"], "model_size": record["model_size"]}
+        for name, record in state.items()
+    }
+    with open(report_path, "w", encoding="utf-8") as json_file:
+        json.dump(report, json_file, indent=4)
+    print(f"Training Report saved in {report_path}")
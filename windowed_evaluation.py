@@ -0,0 +1,149 @@
+import os
+import sys
+import json
+import time
+import treetaggerwrapper
+
+from that_tagging import (file_configs, read_test_sentences, find_that_tag, tag_batch,
+                          tokenize_batch, tag_token_batch)
+
+# Define folder paths
+training_folder = "Training"
+output_folder = "Results"
+
+# Token budget of one TreeTagger call, and window sizes (tokens on each side of "that") to compare
+MAX_BATCH_TOKENS = 2048
+WINDOW_SIZES = [1, 2, 3, 5, 8]
+# Largest accuracy loss (in points) accepted when recommending a window
+TOLERANCE = 0.5
+
+
+def length_bucketed_batches(lengths, max_tokens=MAX_BATCH_TOKENS):
+    """
+    Group item indexes into batches of similar length: items are sorted by length and cut
+    into consecutive batches of at most max_tokens tokens (a longer item gets its own batch).
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches, batch, batch_tokens = [], [], 0
+    for i in order:
+        if batch and batch_tokens + lengths[i] > max_tokens:
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(i)
+        batch_tokens += lengths[i]
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def that_window(tokens, window):
+    """
+    Keep at most window tokens on each side of the first "that" (the whole sentence if there is none).
+    """
+    for i, token in enumerate(tokens):
+        if token.lower() == "that":
+            return tokens[max(0, i - window):i + window + 1]
+    return tokens
+
+
+def load_test_set(configs=file_configs):
+    sentences, expected = [], []
+    for config in configs:
+        if os.path.exists(config["filepath"]):
+            for sentence in read_test_sentences(config["filepath"]):
+                sentences.append(sentence)
+                expected.append(config["expected_label"])
+    return sentences, expected
+
+
+def predict_full(tagger, sentences, max_tokens=MAX_BATCH_TOKENS):
+    """
+    Full-sentence tagging, batched by sentence length.
+    """
+    predictions = [None] * len(sentences)
+    lengths = [len(sentence.split()) for sentence in sentences]
+    for batch in length_bucketed_batches(lengths, max_tokens):
+        for i, tag_lines in zip(batch, tag_batch(tagger, [sentences[i] for i in batch])):
+            predictions[i] = find_that_tag(tag_lines)
+    return predictions, sum(lengths)
+
+
+def predict_windowed(tagger, token_lists, window, max_tokens=MAX_BATCH_TOKENS):
+    """
+    Tag only a bounded token window around each "that", batched by window length.
+    """
+    windows = [that_window(tokens, window) for tokens in token_lists]
+    predictions = [None] * len(windows)
+    lengths = [len(tokens) for tokens in windows]
+    for batch in length_bucketed_batches(lengths, max_tokens):
+        for i, tag_lines in zip(batch, tag_token_batch(tagger, [windows[i] for i in batch])):
+            predictions[i] = find_that_tag(tag_lines)
+    return predictions, sum(lengths)
+
+
+def accuracy(predictions, expected):
+    return (sum(p == e for p, e in zip(predictions, expected)) / len(expected)) * 100 if expected else 0.0
+
+
+def compare_windows(tagger, window_sizes=WINDOW_SIZES, configs=file_configs):
+    """
+    Compare full-sentence tagging with windowed tagging on Data/Test: accuracy, accuracy difference,
+    tokens tagged and throughput (tokenization included) for every window size, plus a recommended window.
+    """
+    sentences, expected = load_test_set(configs)
+
+    start = time.perf_counter()
+    full_predictions, full_tokens = predict_full(tagger, sentences)
+    full_time = time.perf_counter() - start
+    full_accuracy = accuracy(full_predictions, expected)
+    report = {
+        "num_sentences": len(sentences),
+        "full": {"accuracy": full_accuracy, "tokens": full_tokens,
+                 "throughput": len(sentences) / full_time if full_time > 0 else 0.0},
+        "windows": {},
+    }
+
+    # Tokenization is shared by every window size, but windowed tagging cannot skip it in real use,
+    # so its time is added to the elapsed time of every window
+    start = time.perf_counter()
+    token_lists = [None] * len(sentences)
+    for batch in length_bucketed_batches([len(sentence.split()) for sentence in sentences]):
+        for i, tokens in zip(batch, tokenize_batch(tagger, [sentences[i] for i in batch])):
+            token_lists[i] = tokens
+    tokenization_time = time.perf_counter() - start
+    report["tokenization_time"] = tokenization_time
+
+    for window in window_sizes:
+        start = time.perf_counter()
+        predictions, tokens = predict_windowed(tagger, token_lists, window)
+        elapsed = time.perf_counter() - start + tokenization_time
+        window_accuracy = accuracy(predictions, expected)
+        report["windows"][window] = {
+            "accuracy": window_accuracy,
+            "accuracy_difference": window_accuracy - full_accuracy,
+            "tokens": tokens,
+            "throughput": len(sentences) / elapsed if elapsed > 0 else 0.0,
+            "agreement_with_full": accuracy(predictions, full_predictions),
+        }
+
+    acceptable = [w for w, stats in report["windows"].items() if stats["accuracy_difference"] >= -TOLERANCE]
+    report["recommended_window"] = min(acceptable) if acceptable else None
+    return report
+
+
+if __name__ == "__main__":
+    model_name = sys.argv[1] if len(sys.argv) > 1 else "our_model"
+    tagger = treetaggerwrapper.TreeTagger(TAGPARFILE=os.path.join(training_folder, f"{model_name}.par"))
+    report = compare_windows(tagger)
+
+    print(f"Full sentences: {report['full']['accuracy']:.2f}% ({report['full']['throughput']:.1f} sentences/s)")
+    for window, stats in report["windows"].items():
+        print(f"Window +/-{window}: {stats['accuracy']:.2f}% ({stats['accuracy_difference']:+.2f}), "
+              f"{stats['throughput']:.1f} sentences/s, {stats['tokens']} tokens")
+    print(f"Recommended window: {report['recommended_window']}")
+
+    os.makedirs(output_folder, exist_ok=True)
+    report_path = os.path.join(output_folder, f"window_tradeoff_{model_name}.json")
+    with open(report_path, "w", encoding="utf-8") as json_file:
+        json.dump(report, json_file, indent=4)
+    print(f"Window Report saved in {report_path}")